@@ -1,6 +1,7 @@
 
 import { NextRequest, NextResponse } from 'next/server';
 import { prisma } from '@/lib/db';
+import { foldSearchText, searchKeyIds, SEARCH_KEY_CANDIDATES } from '@/lib/search';
 
 export const dynamic = "force-dynamic";
 
@@ -16,14 +17,18 @@ export async function GET(request: NextRequest) {
     }
 
     const results: any[] = [];
+    const foldedQuery = foldSearchText(query);
 
     // Search words
     if (type === 'all' || type === 'words') {
+      // Accent-insensitive matches come from SearchKey (scripts/search_keys.py)
+      const wordIds = await searchKeyIds('Word', query, SEARCH_KEY_CANDIDATES);
       const words = await prisma.word.findMany({
         where: {
           OR: [
             { english: { contains: query, mode: 'insensitive' } },
-            { spanish: { contains: query, mode: 'insensitive' } }
+            { spanish: { contains: query, mode: 'insensitive' } },
+            { id: { in: wordIds } }
           ]
         },
         take: limit,
@@ -41,11 +46,13 @@ export async function GET(request: NextRequest) {
 
     // Search verbs
     if (type === 'all' || type === 'verbs') {
+      const verbIds = await searchKeyIds('Verb', query, SEARCH_KEY_CANDIDATES);
       const verbs = await prisma.verb.findMany({
         where: {
           OR: [
             { infinitive: { contains: query, mode: 'insensitive' } },
-            { spanishTranslation: { contains: query, mode: 'insensitive' } }
+            { spanishTranslation: { contains: query, mode: 'insensitive' } },
+            { id: { in: verbIds } }
           ]
         },
         take: limit,
@@ -64,8 +71,8 @@ export async function GET(request: NextRequest) {
     // Sort by relevance and limit
     const sortedResults = results
       .sort((a, b) => {
-        const aStartsWith = a.title.toLowerCase().startsWith(query.toLowerCase());
-        const bStartsWith = b.title.toLowerCase().startsWith(query.toLowerCase());
+        const aStartsWith = foldSearchText(a.title).startsWith(foldedQuery);
+        const bStartsWith = foldSearchText(b.title).startsWith(foldedQuery);
         if (aStartsWith && !bStartsWith) return -1;
         if (!aStartsWith && bStartsWith) return 1;
         return a.title.localeCompare(b.title);
@@ -1,6 +1,7 @@
 
 import { NextRequest, NextResponse } from 'next/server';
 import { prisma } from '@/lib/db';
+import { searchKeyIds, SEARCH_KEY_CANDIDATES } from '@/lib/search';
 
 export const dynamic = "force-dynamic";
 export const revalidate = 0; // Disable caching completely
@@ -22,7 +23,9 @@ export async function GET(request: NextRequest) {
     if (search) {
       where.OR = [
         { infinitive: { contains: search, mode: 'insensitive' } },
-        { spanishTranslation: { contains: search, mode: 'insensitive' } }
+        { spanishTranslation: { contains: search, mode: 'insensitive' } },
+        // Accent-insensitive matches ("sonar" -> "soñar") from SearchKey
+        { id: { in: await searchKeyIds('Verb', search, SEARCH_KEY_CANDIDATES) } }
       ];
     }
 
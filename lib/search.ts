@@ -0,0 +1,36 @@
+import { prisma } from '@/lib/db'
+
+// Upper bound on SearchKey matches per entity, so short queries don't build
+// an unbounded `id: { in: [...] }` list
+export const SEARCH_KEY_CANDIDATES = 500
+
+// Same folding as scripts/search_keys.py: no diacritics (ñ -> n), lowercase,
+// punctuation replaced by spaces, whitespace collapsed
+export function foldSearchText(text: string): string {
+  return text
+    .normalize('NFKD')
+    .replace(/\p{M}/gu, '')
+    .toLowerCase()
+    .replace(/[^\p{L}\p{N}_\s\/,;'-]/gu, ' ')
+    .replace(/\s+/g, ' ')
+    .trim()
+}
+
+// Ids of Word/Verb rows with a folded SearchKey containing the folded query,
+// so "sonar" also finds "soñar" (uses searchkey_key_trgm_idx)
+export async function searchKeyIds(
+  entity: 'Word' | 'Verb',
+  query: string,
+  take: number = SEARCH_KEY_CANDIDATES
+): Promise<string[]> {
+  const key = foldSearchText(query)
+  if (!key) return []
+
+  const matches = await prisma.searchKey.findMany({
+    where: { entity, key: { contains: key } },
+    select: { entityId: true },
+    distinct: ['entityId'],
+    take,
+  })
+  return matches.map((match) => match.entityId)
+}
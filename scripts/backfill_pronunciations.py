@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Script para completar Verb.pronunciationIPA y Word.pronunciation desde data/ipa_dict.json
+"""
+import time
+import argparse
+import psycopg2
+from functools import partial
+
+from fix_verb_translations import load_env
+from ipa_lookup import IpaLookup, first_ipa
+from verb_db import (
+    VerbWriter, Checkpoint, process_verbs, process_verbs_parallel, add_reader_arguments, add_writer_arguments,
+    DEFAULT_ITERSIZE
+)
+
+# (tabla, columna con la palabra inglesa, columna de pronunciación)
+TARGETS = [
+    ('Verb', 'infinitive', 'pronunciationIPA'),
+    ('Word', 'english', 'pronunciation'),
+]
+
+# Generar actualizaciones para un bloque
+def build_pronunciation_updates(rows, ipa, overwrite=False):
+    """Busca la pronunciación de un bloque de filas (id, palabra, pronunciación actual)
+
+    Las palabras de un bloque se resuelven juntas con IpaLookup.get_many; las
+    frases de varias palabras ("give up") se componen palabra a palabra.
+    """
+    pending = [(row_id, word) for row_id, word, current in rows
+               if word and (overwrite or not current)]
+    single = [word for _, word in pending if ' ' not in word.strip()]
+    found = ipa.get_many(single)
+
+    updates = []
+    not_found = []
+    for row_id, word in pending:
+        if word in found:
+            pronunciation = first_ipa(found[word])
+        else:
+            pronunciation = ipa.phrase_ipa(word) if ' ' in word.strip() else None
+
+        if pronunciation:
+            updates.append((pronunciation, row_id))
+        else:
+            not_found.append(word)
+
+    return updates, not_found, len(rows) - len(pending)
+
+# Completar pronunciaciones en la base de datos
+def backfill_pronunciations(database_url, ipa, write_mode, page_size=100, stream=True,
+                            itersize=DEFAULT_ITERSIZE, chunk_size=None, resume=False, overwrite=False,
+                            workers=1):
+    """Completa las pronunciaciones de "Verb" y "Word" y devuelve las estadísticas por tabla
+
+    Con workers > 1 cada tabla se reparte en rangos de id procesados en paralelo
+    (IpaLookup solo lee del mmap, así que puede compartirse entre hilos).
+    """
+    print(f"Conectando a la base de datos...")
+    conn = None if workers > 1 else psycopg2.connect(database_url)
+    results = {}
+
+    for table, word_column, ipa_column in TARGETS:
+        start = time.perf_counter()
+        make_writer = partial(VerbWriter, columns=[ipa_column], mode=write_mode, page_size=page_size, table=table)
+        build_updates = partial(build_pronunciation_updates, ipa=ipa, overwrite=overwrite)
+        if workers > 1:
+            stats = process_verbs_parallel(
+                database_url, workers, make_writer, [word_column, ipa_column], build_updates,
+                stream=stream, itersize=itersize, chunk_size=chunk_size, resume=resume, table=table
+            )
+        else:
+            cursor = conn.cursor()
+            stats = process_verbs(
+                conn,
+                make_writer(cursor),
+                [word_column, ipa_column],
+                build_updates,
+                stream=stream,
+                itersize=itersize,
+                chunk_size=chunk_size,
+                checkpoint=Checkpoint(f'backfill_pronunciations_{table.lower()}'),
+                resume=resume,
+                table=table
+            )
+            cursor.close()
+        stats['seconds'] = time.perf_counter() - start
+        results[table] = stats
+
+        print(f"\n📊 {table}.{ipa_column}: {stats['updated']} completadas, "
+              f"{stats['skipped']} ya tenían valor, {len(stats['not_found'])} sin IPA "
+              f"({stats['seconds']:.2f}s)")
+        if stats['not_found']:
+            print(f"   Primeras sin IPA: {stats['not_found'][:10]}")
+
+    if conn:
+        conn.close()
+    return results
+
+# Main
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Completa pronunciaciones IPA de verbos y palabras')
+    add_reader_arguments(parser)
+    add_writer_arguments(parser)
+    parser.add_argument(
+        '--overwrite', action='store_true',
+        help='Reescribir también las pronunciaciones que ya tienen valor'
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("COMPLETAR PRONUNCIACIONES IPA")
+    print("=" * 60)
+
+    env_vars = load_env()
+    database_url = env_vars.get('DATABASE_URL')
+
+    if not database_url:
+        print("❌ ERROR: No se encontró DATABASE_URL en .env")
+        exit(1)
+
+    with IpaLookup() as ipa:
+        print(f"\n📚 Diccionario IPA: {ipa.path} "
+              f"({len(ipa.block_offsets)} bloques, {len(ipa.out_of_order)} entradas fuera de orden)")
+        backfill_pronunciations(
+            database_url, ipa, args.writer, page_size=args.page_size, stream=args.stream,
+            itersize=args.itersize, chunk_size=args.chunk_size, resume=args.resume,
+            overwrite=args.overwrite, workers=args.workers
+        )
+
+    print("\n✅ Proceso completado!")
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Benchmark del pipeline de corrección de verbos con datos sintéticos
+
+Para cada tamaño (por defecto 1k, 10k, 100k y 1M filas) genera un CSV con el
+formato de Jehle y una tabla "Verb" sintéticos y mide cada fase por separado:
+
+  csv_parse         ConjugationStore.from_csv
+  cache_load        load_conjugation_store con la caché binaria ya creada
+  build_map         verbs_dict_from_store + create_english_to_spanish_map
+  generate_updates  build_verb_updates sobre todas las filas de "Verb"
+  fuzzy_match       FuzzyVerbMatcher sobre los verbos no encontrados
+  select            lectura de "Verb" con el cursor server-side (solo con base de datos)
+  write_copy        VerbWriter en modo copy
+  write_batch       VerbWriter en modo batch
+
+Con --database-url las lecturas y escrituras van contra un Postgres desechable:
+los datos se cargan en un esquema temporal que se borra al terminar y cada
+escritura se deshace con rollback. Sin base de datos, las escrituras usan un
+cursor sustituto que solo serializa los lotes (mide el coste del lado Python).
+
+Cada fase informa de filas/s y pico de RSS. Los resultados se añaden como JSON
+lines a scripts/.cache/benchmarks.jsonl y se comparan con la ejecución anterior.
+"""
+import os
+import csv
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+
+import fix_verb_translations_v2 as v2
+from fuzzy_matcher import FuzzyVerbMatcher
+from jehle_conjugations import ConjugationStore, load_conjugation_store
+from verb_db import VerbWriter, iter_verb_chunks, rows_to_binary_copy_buffer, SCRIPTS_DIR
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = os.path.join(SCRIPTS_DIR, '.cache', 'benchmarks.jsonl')
+
+# Consultas aproximadas como máximo por tamaño (el matcher es la fase más lenta por consulta)
+DEFAULT_FUZZY_SAMPLE = 10_000
+
+CSV_HEADER = [
+    'infinitive', 'infinitive_english', 'mood', 'mood_english', 'tense', 'tense_english',
+    'verb_english', 'form_1s', 'form_2s', 'form_3s', 'form_1p', 'form_2p', 'form_3p',
+    'gerund', 'gerund_english', 'pastparticiple', 'pastparticiple_english',
+]
+
+# (modo, modo en inglés, tiempo, tiempo en inglés): 10 filas del CSV por verbo
+MOODS_TENSES = [
+    ('Indicativo', 'Indicative', 'Presente', 'Present'),
+    ('Indicativo', 'Indicative', 'Pretérito', 'Preterite'),
+    ('Indicativo', 'Indicative', 'Imperfecto', 'Imperfect'),
+    ('Indicativo', 'Indicative', 'Futuro', 'Future'),
+    ('Indicativo', 'Indicative', 'Condicional', 'Conditional'),
+    ('Indicativo', 'Indicative', 'Presente perfecto', 'Present Perfect'),
+    ('Subjuntivo', 'Subjunctive', 'Presente', 'Present'),
+    ('Subjuntivo', 'Subjunctive', 'Imperfecto', 'Imperfect'),
+    ('Subjuntivo', 'Subjunctive', 'Futuro', 'Future'),
+    ('Imperativo Afirmativo', 'Imperative Affirmative', 'Presente', 'Present'),
+]
+
+# Reparto de las filas de "Verb": coincidencia exacta, errata (para el matcher) o desconocido
+EXACT_SHARE = 0.7
+TYPO_SHARE = 0.2
+
+_CONSONANTS = 'bcdfglmnprstv'
+_VOWELS = 'aeiou'
+
+
+def synthetic_word(index, salt=0):
+    """Palabra pronunciable y única para cada índice (sílabas consonante + vocal)"""
+    n = index * 7919 + salt
+    syllables = []
+    while True:
+        n, consonant = divmod(n, len(_CONSONANTS))
+        n, vowel = divmod(n, len(_VOWELS))
+        syllables.append(_CONSONANTS[consonant] + _VOWELS[vowel])
+        if n == 0 and len(syllables) >= 2:
+            break
+    return ''.join(syllables)
+
+
+def _typo(word, rng):
+    position = rng.randrange(len(word))
+    return word[:position] + word[position + 1:] if rng.random() < 0.5 else word[:position] + 'x' + word[position:]
+
+# Datos sintéticos
+def write_synthetic_csv(path, rows):
+    """CSV con el formato de Jehle y `rows` filas; devuelve la lista de glosas inglesas"""
+    n_verbs = max(rows // len(MOODS_TENSES), 1)
+    english_words = []
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(CSV_HEADER)
+        written = 0
+        for verb in range(n_verbs):
+            stem = synthetic_word(verb, salt=1)
+            ending = ('ar', 'er', 'ir')[verb % 3]
+            english = synthetic_word(verb, salt=2)
+            english_words.append(english)
+            vowel = ending[0]
+            for mood, mood_en, tense, tense_en in MOODS_TENSES:
+                if written == rows:
+                    break
+                forms = [stem + suffix for suffix in ('o', 's', vowel, vowel + 'mos', vowel + 'is', vowel + 'n')]
+                writer.writerow([
+                    stem + ending, f'to {english}', mood, mood_en, tense, tense_en, f'I {english}',
+                    *forms, stem + 'ando', f'{english}ing', stem + 'ado', f'{english}ed',
+                ])
+                written += 1
+    return english_words
+
+
+def synthetic_verb_rows(rows, english_words, seed=0):
+    """Filas (id, infinitive, spanishTranslation, spanishExamples) de una tabla "Verb" sintética"""
+    rng = random.Random(seed)
+    result = []
+    for i in range(rows):
+        draw = rng.random()
+        word = english_words[i % len(english_words)]
+        if draw < EXACT_SHARE:
+            infinitive = word
+        elif draw < EXACT_SHARE + TYPO_SHARE:
+            infinitive = _typo(word, rng)
+        else:
+            infinitive = synthetic_word(i, salt=3)
+        result.append((f'c{i:024d}', infinitive, None, None))
+    return result
+
+# Medición
+def _reset_peak_rss():
+    """Reinicia el pico de RSS del proceso (solo Linux); devuelve si fue posible"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Sin /proc: pico de todo el proceso (KB en Linux, bytes en macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+class NullCursor:
+    """Cursor sustituto: consume los buffers de COPY y no envía nada"""
+    rowcount = 0
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return (1,)
+
+    def mogrify(self, query, params):
+        # execute_batch formatea cada sentencia con mogrify antes de enviar la página
+        return (query % tuple(repr(value) for value in params)).encode('utf-8')
+
+    def copy_expert(self, query, buf):
+        data = buf.read()
+        self.rowcount = data.count('\n') if isinstance(data, str) else 0
+
+
+class Benchmark:
+    """Resultados de una ejecución del benchmark"""
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.results = []
+
+    def measure(self, size, stage, func):
+        """Ejecuta func(), que devuelve (filas procesadas, valor), registra la fase y devuelve el valor"""
+        exact_peak = _reset_peak_rss()
+        start = time.perf_counter()
+        rows, value = func()
+        seconds = time.perf_counter() - start
+        result = {
+            'size': size,
+            'stage': stage,
+            'rows': rows,
+            'seconds': round(seconds, 6),
+            'rows_per_s': round(rows / seconds, 1) if seconds else None,
+            'peak_rss_mb': round(_peak_rss_mb(), 1),
+            'peak_rss_exact': exact_peak,
+        }
+        self.results.append(result)
+        print(f"   {stage:<18} {rows:>9} filas {seconds:9.3f}s {result['rows_per_s'] or 0:>13,.0f} filas/s "
+              f"{result['peak_rss_mb']:8.1f} MB RSS")
+        return value
+
+# Fases
+def run_size(bench, size, workdir, database_url=None, fuzzy_sample=DEFAULT_FUZZY_SAMPLE):
+    print(f"\n📏 {size:,} filas")
+    csv_path = os.path.join(workdir, f'jehle_{size}.csv')
+    english_words = write_synthetic_csv(csv_path, size)
+    verb_rows = synthetic_verb_rows(size, english_words)
+    cache_dir = os.path.join(workdir, 'cache')
+
+    store = bench.measure(size, 'csv_parse', lambda: (size, ConjugationStore.from_csv(csv_path)))
+    load_conjugation_store(csv_path, cache_dir=cache_dir)
+    store = bench.measure(size, 'cache_load', lambda: (size, load_conjugation_store(csv_path, cache_dir=cache_dir)))
+
+    def build_map():
+        verbs_dict = v2.verbs_dict_from_store(store)
+        return len(verbs_dict), v2.create_english_to_spanish_map(verbs_dict)
+    eng_to_spa_map = bench.measure(size, 'build_map', build_map)
+
+    def generate():
+        updates, not_found, _ = v2.build_verb_updates(verb_rows, eng_to_spa_map)
+        return len(verb_rows), (updates, not_found)
+    updates, not_found = bench.measure(size, 'generate_updates', generate)
+
+    def fuzzy():
+        matcher = FuzzyVerbMatcher(eng_to_spa_map)
+        queries = not_found[:fuzzy_sample]
+        for query in queries:
+            matcher.accept(query)
+        return len(queries), None
+    bench.measure(size, 'fuzzy_match', fuzzy)
+
+    if database_url:
+        _run_database_stages(bench, size, database_url, verb_rows, updates)
+    else:
+        for mode in ('copy', 'batch'):
+            writer = VerbWriter(NullCursor(), ['spanishTranslation', 'spanishExamples'], mode=mode,
+                                casts={'spanishExamples': '::jsonb'})
+            bench.measure(size, f'write_{mode}', lambda: (len(updates), writer.write(updates)))
+
+
+def _run_database_stages(bench, size, database_url, verb_rows, updates):
+    import psycopg2
+
+    schema = f'bench_{uuid.uuid4().hex[:8]}'
+    conn = psycopg2.connect(database_url)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f'CREATE SCHEMA {schema}')
+        cursor.execute(f'SET search_path TO {schema}')
+        cursor.execute('''
+            CREATE TABLE "Verb" (
+                id text PRIMARY KEY,
+                infinitive text NOT NULL,
+                "spanishTranslation" text,
+                "spanishExamples" jsonb,
+                "updatedAt" timestamp(3) NOT NULL DEFAULT NOW()
+            )
+        ''')
+        cursor.copy_expert(
+            'COPY "Verb" (id, infinitive, "spanishTranslation", "spanishExamples") FROM STDIN WITH (FORMAT binary)',
+            rows_to_binary_copy_buffer(verb_rows, ['text', 'text', 'text', 'jsonb'])
+        )
+        conn.commit()
+
+        def select():
+            total = 0
+            for rows in iter_verb_chunks(conn, ['infinitive', 'spanishTranslation', 'spanishExamples']):
+                total += len(rows)
+            conn.commit()
+            return total, None
+        bench.measure(size, 'select', select)
+
+        for mode in ('copy', 'batch'):
+            writer = VerbWriter(cursor, ['spanishTranslation', 'spanishExamples'], mode=mode,
+                                casts={'spanishExamples': '::jsonb'})
+            bench.measure(size, f'write_{mode}', lambda: (len(updates), writer.write(updates)))
+            conn.rollback()
+            writer.reset()
+    finally:
+        conn.rollback()
+        cursor.execute(f'DROP SCHEMA IF EXISTS {schema} CASCADE')
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+# Resultados
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous_results(output_path, database):
+    """Último resultado guardado de cada (tamaño, fase) medido en el mismo modo: {(tamaño, fase): registro}
+
+    Solo se comparan ejecuciones con base de datos real entre sí, o con el cursor
+    sustituto entre sí: mezclarlas compararía tiempo de red y servidor con tiempo
+    de cliente. El escritor (copy/batch) ya forma parte del nombre de la fase.
+    """
+    if not os.path.exists(output_path):
+        return {}
+    previous = {}
+    with open(output_path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get('database') == database:
+                previous[(record['size'], record['stage'])] = record
+    return previous
+
+
+def save_results(bench, output_path, metadata):
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'a') as f:
+        for result in bench.results:
+            f.write(json.dumps({'run_id': bench.run_id, **metadata, **result}) + '\n')
+
+
+def print_comparison(bench, previous):
+    if not previous:
+        return
+    mode = 'base de datos real' if next(iter(previous.values()))['database'] else 'cursor sustituto'
+    print(f"\n📊 Comparación con la medición anterior de cada fase ({mode}):")
+    for result in bench.results:
+        before = previous.get((result['size'], result['stage']))
+        if not before or not before['rows_per_s'] or not result['rows_per_s']:
+            continue
+        change = (result['rows_per_s'] / before['rows_per_s'] - 1) * 100
+        print(f"   {result['size']:>9} {result['stage']:<18} {before['rows_per_s']:>13,.0f} -> "
+              f"{result['rows_per_s']:>13,.0f} filas/s ({change:+.1f}%, ejecución {before['run_id']})")
+
+# Main
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline de corrección de verbos')
+    parser.add_argument(
+        '--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='Tamaños a medir, separados por comas'
+    )
+    parser.add_argument(
+        '--database-url', default=None,
+        help='Postgres desechable para medir lecturas y escrituras reales (usa un esquema temporal)'
+    )
+    parser.add_argument(
+        '--fuzzy-sample', type=int, default=DEFAULT_FUZZY_SAMPLE,
+        help='Máximo de verbos no encontrados a pasar por el matcher aproximado'
+    )
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Fichero JSON lines de resultados')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BENCHMARK DEL PIPELINE DE VERBOS")
+    print("=" * 70)
+
+    if not args.database_url:
+        print("ℹ️  Sin --database-url: las escrituras usan un cursor sustituto")
+
+    bench = Benchmark(uuid.uuid4().hex[:12])
+    previous = load_previous_results(args.output, database=bool(args.database_url))
+    with tempfile.TemporaryDirectory(prefix='verb_bench_') as workdir:
+        for size in (int(value) for value in args.sizes.split(',')):
+            run_size(bench, size, workdir, database_url=args.database_url, fuzzy_sample=args.fuzzy_sample)
+
+    metadata = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'database': bool(args.database_url),
+    }
+    save_results(bench, args.output, metadata)
+    print_comparison(bench, previous)
+    print(f"\n✅ Resultados guardados en {args.output} (ejecución {bench.run_id})")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Carga rápida de "Word" y "Verb" con COPY binario, equivalente a la parte de
+palabras y verbos de scripts/seed.ts
+
+En lugar de un prisma.word.upsert / prisma.verb.upsert por registro, cada tabla
+se carga con un único COPY (FORMAT binary) a una tabla temporal y se fusiona con
+un INSERT ... ON CONFLICT DO UPDATE. Usuario de prueba, juegos y logros siguen
+creándose con seed.ts.
+"""
+import os
+import json
+import time
+import uuid
+import random
+import argparse
+import psycopg2
+
+from fix_verb_translations import load_env
+from search_keys import sync_search_keys_after_run
+from verb_db import rows_to_binary_copy_buffer, quote_ident
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DICTIONARY_PATH = os.path.join(ROOT_DIR, 'data', 'dictionary_data.json')
+VERBS_PATH = os.path.join(ROOT_DIR, 'data', 'verbs_data.json')
+
+# Mismas categorías aleatorias que seed.ts
+WORD_CATEGORIES = ['general', 'travel', 'business', 'academic', 'daily_life', 'technology']
+
+PG_TYPES = {'text': 'text', 'int4': 'integer', 'bool': 'boolean', 'jsonb': 'jsonb'}
+
+# (columna, tipo) en el orden del COPY; la primera columna tras id es la clave única
+WORD_COLUMNS = [
+    ('id', 'text'), ('english', 'text'), ('spanish', 'text'), ('level', 'text'),
+    ('pronunciation', 'text'), ('partOfSpeech', 'text'), ('definition', 'text'),
+    ('examples', 'jsonb'), ('difficulty', 'int4'), ('category', 'text'),
+]
+# difficulty y category son aleatorias en seed.ts: no se sobrescriben al fusionar
+WORD_UPDATE_COLUMNS = ['spanish', 'level', 'pronunciation', 'partOfSpeech', 'definition', 'examples']
+
+VERB_COLUMNS = [
+    ('id', 'text'), ('infinitive', 'text'), ('thirdPersonSingular', 'text'),
+    ('presentParticiple', 'text'), ('simplePast', 'text'), ('pastParticiple', 'text'),
+    ('spanishTranslation', 'text'), ('pronunciationIPA', 'text'), ('audioUrl', 'text'),
+    ('level', 'text'), ('category', 'text'), ('isIrregular', 'bool'), ('isModal', 'bool'),
+    ('isPhrasal', 'bool'), ('examples', 'jsonb'),
+]
+VERB_UPDATE_COLUMNS = [name for name, _ in VERB_COLUMNS[2:]]
+
+
+def new_id():
+    """Id con el mismo aspecto que los cuid de Prisma (25 caracteres, empieza por 'c')"""
+    return 'c' + uuid.uuid4().hex[:24]
+
+
+def _examples_json(examples):
+    # seed.ts guarda JSON.stringify(examples) en un campo Json: un string JSON con
+    # el array dentro, que es lo que esperan los clientes al hacer JSON.parse
+    return json.dumps(json.dumps(examples)) if examples else None
+
+# Preparar filas
+def load_word_rows(dictionary_path=DICTIONARY_PATH):
+    """Filas de "Word" a partir de dictionary_data.json (la primera aparición de cada palabra gana)"""
+    with open(dictionary_path, 'r', encoding='utf-8') as f:
+        dictionary_data = json.load(f)
+
+    rows = []
+    seen = set()
+    for level_key, level_data in dictionary_data['levels'].items():
+        for word in level_data['words']:
+            if word['english'] in seen:
+                continue
+            seen.add(word['english'])
+            rows.append((
+                new_id(),
+                word['english'],
+                word['spanish'],
+                level_key,
+                word.get('pronunciation') or None,
+                word.get('part_of_speech') or None,
+                word.get('definition') or None,
+                _examples_json(word.get('examples')),
+                random.randint(1, 5),
+                random.choice(WORD_CATEGORIES),
+            ))
+    return rows
+
+
+def load_verb_rows(verbs_path=VERBS_PATH):
+    """Filas de "Verb" a partir de verbs_data.json (la primera aparición de cada verbo gana)"""
+    with open(verbs_path, 'r', encoding='utf-8') as f:
+        verbs_data = json.load(f)
+
+    rows = []
+    seen = set()
+    for verb in verbs_data:
+        if verb['infinitive'] in seen:
+            continue
+        seen.add(verb['infinitive'])
+        conjugations = verb['conjugations']
+        pronunciation = verb.get('pronunciation') or {}
+        properties = verb.get('properties') or {}
+        rows.append((
+            new_id(),
+            verb['infinitive'],
+            conjugations['third_person_singular'],
+            conjugations['present_participle'],
+            conjugations['simple_past'],
+            conjugations['past_participle'],
+            verb['spanish_translation'],
+            pronunciation.get('ipa') or None,
+            pronunciation.get('audio_url') or None,
+            verb['cefr_level'],
+            verb.get('category'),
+            bool(properties.get('irregular')),
+            bool(properties.get('modal')),
+            bool(properties.get('phrasal')),
+            _examples_json(verb.get('examples')),
+        ))
+    return rows
+
+# Cargar una tabla
+def seed_table(cursor, table, columns, update_columns, rows, insert_only=False):
+    """Carga `rows` en `table` con COPY binario + INSERT ... ON CONFLICT
+
+    Devuelve (insertadas, actualizadas). Las filas existentes sin cambios en
+    update_columns no se tocan (ni siquiera "updatedAt").
+    """
+    staging = f'{table.lower()}_seed'
+    key = columns[1][0]
+    names = [name for name, _ in columns]
+    col_list = ', '.join(quote_ident(name) for name in names)
+
+    cursor.execute(
+        f'CREATE TEMP TABLE {staging} ('
+        + ', '.join(f'{quote_ident(name)} {PG_TYPES[pg_type]}' for name, pg_type in columns)
+        + ') ON COMMIT DROP'
+    )
+    cursor.copy_expert(
+        f'COPY {staging} ({col_list}) FROM STDIN WITH (FORMAT binary)',
+        rows_to_binary_copy_buffer(rows, [pg_type for _, pg_type in columns])
+    )
+
+    if insert_only:
+        conflict = 'DO NOTHING'
+    else:
+        assignments = ', '.join(
+            f'{quote_ident(name)} = EXCLUDED.{quote_ident(name)}' for name in update_columns
+        )
+        current = ', '.join(f't.{quote_ident(name)}' for name in update_columns)
+        incoming = ', '.join(f'EXCLUDED.{quote_ident(name)}' for name in update_columns)
+        conflict = (
+            f'DO UPDATE SET {assignments}, "updatedAt" = NOW() '
+            f'WHERE ({current}) IS DISTINCT FROM ({incoming})'
+        )
+
+    cursor.execute(f'''
+        WITH upserted AS (
+            INSERT INTO {quote_ident(table)} AS t ({col_list}, "updatedAt")
+            SELECT {col_list}, NOW() FROM {staging}
+            ON CONFLICT ({quote_ident(key)}) {conflict}
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT
+            count(*) FILTER (WHERE inserted),
+            count(*) FILTER (WHERE NOT inserted)
+        FROM upserted
+    ''')
+    inserted, updated = cursor.fetchone()
+    return inserted, updated
+
+# Main
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Carga rápida de palabras y verbos con COPY binario')
+    parser.add_argument('--dictionary', default=DICTIONARY_PATH, help='Ruta de dictionary_data.json')
+    parser.add_argument('--verbs', default=VERBS_PATH, help='Ruta de verbs_data.json')
+    parser.add_argument(
+        '--insert-only', action='store_true',
+        help='No modificar filas existentes (ON CONFLICT DO NOTHING, como seed.ts)'
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CARGA RÁPIDA DE PALABRAS Y VERBOS")
+    print("=" * 60)
+
+    env_vars = load_env()
+    database_url = env_vars.get('DATABASE_URL')
+
+    if not database_url:
+        print("❌ ERROR: No se encontró DATABASE_URL en .env")
+        exit(1)
+
+    print(f"\n📚 Cargando {args.dictionary} y {args.verbs}...")
+    tables = [
+        ('Word', WORD_COLUMNS, WORD_UPDATE_COLUMNS, load_word_rows(args.dictionary)),
+        ('Verb', VERB_COLUMNS, VERB_UPDATE_COLUMNS, load_verb_rows(args.verbs)),
+    ]
+
+    conn = psycopg2.connect(database_url)
+    cursor = conn.cursor()
+    total_rows = 0
+    total_start = time.perf_counter()
+
+    for table, columns, update_columns, rows in tables:
+        start = time.perf_counter()
+        inserted, updated = seed_table(cursor, table, columns, update_columns, rows, args.insert_only)
+        conn.commit()
+        elapsed = time.perf_counter() - start
+        total_rows += len(rows)
+        print(f"✅ {table}: {len(rows)} filas en {elapsed:.2f}s ({len(rows) / elapsed:,.0f} filas/s) "
+              f"- {inserted} insertadas, {updated} actualizadas, "
+              f"{len(rows) - inserted - updated} sin cambios")
+
+    cursor.close()
+    conn.close()
+
+    total_elapsed = time.perf_counter() - total_start
+    print(f"\n⚡ Total: {total_rows} filas en {total_elapsed:.2f}s ({total_rows / total_elapsed:,.0f} filas/s)")
+
+    # Claves de búsqueda sin tildes de las filas nuevas o cambiadas
+    sync_search_keys_after_run(database_url)
+    print("\n✅ Proceso completado!")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Script unificado para corregir verbos en una sola pasada
+
+Combina fix_verb_translations.py (translation/description/example) y
+fix_verb_translations_v2.py (spanishTranslation/spanishExamples): lee el CSV de
+Jehle una vez, recorre la tabla "Verb" una vez y envía una única escritura con
+todas las columnas derivadas.
+"""
+import time
+import argparse
+import psycopg2
+from functools import partial
+
+import fix_verb_translations as v1
+import fix_verb_translations_v2 as v2
+from fuzzy_matcher import FuzzyVerbMatcher, write_candidates_report, DEFAULT_THRESHOLD
+from instrumentation import span, add_instrumentation_arguments, configure_from_args, flush_metrics
+from jehle_conjugations import load_conjugation_store
+from search_keys import sync_search_keys_after_run
+from verb_db import (
+    VerbWriter, Checkpoint, process_verbs, add_reader_arguments, add_writer_arguments,
+    process_verbs_parallel, DryRunWriter, DEFAULT_WRITE_MODE, DEFAULT_ITERSIZE
+)
+from verb_mirror import open_mirror, add_mirror_arguments
+from verb_pipeline import process_verbs_pipelined, add_pipeline_arguments, DEFAULT_QUEUE_SIZE
+
+# Columnas que se leen de "Verb" (además de id) y columnas que se escriben
+READ_COLUMNS = [
+    'infinitive', 'translation', 'description', 'example',
+    'spanishTranslation', 'spanishExamples'
+]
+WRITE_COLUMNS = ['translation', 'description', 'example', 'spanishTranslation', 'spanishExamples']
+
+NOT_FOUND_FILE = '/home/ubuntu/github_repos/english_master_pro_improved/scripts/verbs_not_found.txt'
+FUZZY_CANDIDATES_FILE = '/home/ubuntu/github_repos/english_master_pro_improved/scripts/verbs_fuzzy_candidates.txt'
+
+# Cargar los datos de ambos scripts en una sola lectura del CSV
+def load_jehle_datasets(csv_path):
+    """Devuelve (verbs_dict de v1, verbs_dict de v2) leyendo el CSV una sola vez"""
+    store = load_conjugation_store(csv_path)
+    return v1.verbs_dict_from_store(store), v2.verbs_dict_from_store(store)
+
+# Generar las actualizaciones combinadas de un bloque
+def build_combined_updates(db_verbs, verbs_dict, eng_to_spa_map, fuzzy_matcher=None):
+    """Aplica las reglas de v1 y v2 a un bloque y combina el resultado por id
+
+    Las columnas que una de las dos reglas no cambia quedan en None, y el writer
+    (con coalesce=True) las deja como están en la base de datos.
+    """
+    v1_rows = [(verb_id, inf, tr, desc, ex) for verb_id, inf, tr, desc, ex, _, _ in db_verbs]
+    v2_rows = [(verb_id, inf, st, se) for verb_id, inf, _, _, _, st, se in db_verbs]
+
+    v1_updates, v1_not_found, _ = v1.build_verb_updates(v1_rows, verbs_dict)
+    v2_updates, v2_not_found, _ = v2.build_verb_updates(v2_rows, eng_to_spa_map, fuzzy_matcher)
+
+    combined = {}
+    for translation, description, example, verb_id in v1_updates:
+        combined[verb_id] = [translation, description, example, None, None]
+    for spanish_verb, spanish_examples, verb_id in v2_updates:
+        values = combined.setdefault(verb_id, [None, None, None, None, None])
+        values[3:] = [spanish_verb, spanish_examples]
+
+    updates = [tuple(values) + (verb_id,) for verb_id, values in combined.items()]
+
+    # Un verbo solo cuenta como no encontrado si ninguna de las dos reglas lo reconoce
+    v1_missing = set(v1_not_found)
+    not_found = [inf for inf in v2_not_found if inf in v1_missing]
+    skipped = len(db_verbs) - len(updates) - len(not_found)
+
+    return updates, not_found, skipped
+
+# Actualizar base de datos
+def update_verbs_in_database(verbs_dict, eng_to_spa_map, database_url, write_mode=DEFAULT_WRITE_MODE,
+                             page_size=100, stream=True, itersize=DEFAULT_ITERSIZE, chunk_size=None,
+                             resume=False, fuzzy_matcher=None, pipeline=False, queue_size=DEFAULT_QUEUE_SIZE,
+                             workers=1, mirror=None, dry_run=False):
+    """Actualiza todas las columnas derivadas de los verbos con una sola pasada"""
+
+    build_updates = partial(
+        build_combined_updates,
+        verbs_dict=verbs_dict,
+        eng_to_spa_map=eng_to_spa_map,
+        fuzzy_matcher=fuzzy_matcher
+    )
+    checkpoint = Checkpoint('fix_verbs')
+    make_writer = partial(
+        VerbWriter,
+        columns=WRITE_COLUMNS,
+        mode=write_mode,
+        page_size=page_size,
+        casts={'spanishExamples': '::jsonb'},
+        coalesce=True
+    )
+
+    if dry_run:
+        make_writer = DryRunWriter
+    if (mirror or dry_run) and (pipeline or workers > 1):
+        print("⚠️  --mirror y --dry-run usan el modo de una conexión: se ignoran --pipeline y --workers")
+        pipeline = False
+        workers = 1
+
+    if pipeline:
+        # Lectura, generación y escritura solapadas (asyncpg)
+        print(f"Conectando a la base de datos (modo pipeline)...")
+        stats = process_verbs_pipelined(
+            database_url,
+            READ_COLUMNS,
+            WRITE_COLUMNS,
+            build_updates,
+            chunk_size=chunk_size,
+            checkpoint=checkpoint,
+            resume=resume,
+            casts={'spanishExamples': '::jsonb'},
+            coalesce=True,
+            queue_size=queue_size
+        )
+        mode = 'pipeline'
+    elif workers > 1:
+        # Rangos de id en paralelo, cada uno con su propia conexión
+        print(f"Conectando a la base de datos ({workers} conexiones en paralelo)...")
+        stats = process_verbs_parallel(
+            database_url, workers, make_writer, READ_COLUMNS, build_updates,
+            stream=stream, itersize=itersize, chunk_size=chunk_size, resume=resume
+        )
+        mode = f"{stats['round_trips']} round-trips, modo {write_mode}, {workers} workers"
+    else:
+        print(f"Conectando a la base de datos...")
+        source = open_mirror(database_url, sync=mirror == 'sync') if mirror else None
+        # En seco y leyendo de la réplica no hace falta la base de datos remota
+        conn = None if dry_run and source else psycopg2.connect(database_url)
+        cursor = conn.cursor() if conn else None
+        writer = make_writer(cursor)
+
+        stats = process_verbs(
+            conn,
+            writer,
+            READ_COLUMNS,
+            build_updates,
+            stream=stream,
+            itersize=itersize,
+            chunk_size=chunk_size,
+            checkpoint=None if dry_run else checkpoint,
+            resume=resume,
+            source=source
+        )
+        if conn:
+            cursor.close()
+            conn.close()
+        if source:
+            source.close()
+        mode = f"{writer.round_trips} round-trips, modo {write_mode}"
+    not_found = stats['not_found']
+
+    print(f"Encontrados {stats['total']} verbos en la base de datos")
+    print(f"\nVerbos actualizados: {stats['updated']}")
+    print(f"Verbos sin cambios (omitidos): {stats['skipped']}")
+    print(f"Verbos no encontrados: {len(not_found)}")
+
+    if not_found:
+        print(f"\nPrimeros 20 verbos no encontrados: {not_found[:20]}")
+
+    if dry_run:
+        print(f"🧪 Modo en seco: no se ha escrito nada ({stats['updated']} verbos se actualizarían)")
+    elif stats['updated']:
+        print(f"✅ Actualización completada exitosamente! ({mode})")
+
+    return stats['updated'], stats['skipped'], len(not_found), not_found
+
+# Main
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Corrige traducciones y ejemplos de verbos en una sola pasada')
+    add_reader_arguments(parser)
+    add_writer_arguments(parser)
+    add_mirror_arguments(parser)
+    add_pipeline_arguments(parser)
+    add_instrumentation_arguments(parser)
+    parser.add_argument(
+        '--fuzzy', action='store_true',
+        help='Aceptar automáticamente coincidencias aproximadas por encima del umbral'
+    )
+    parser.add_argument(
+        '--fuzzy-threshold', type=float, default=DEFAULT_THRESHOLD,
+        help='Puntuación mínima (0-1) para aceptar una coincidencia aproximada'
+    )
+    args = parser.parse_args()
+    configure_from_args('fix_verbs', args)
+
+    print("=" * 70)
+    print("CORRECCIÓN UNIFICADA DE VERBOS")
+    print("=" * 70)
+
+    # Cargar variables de entorno
+    with span('load_env'):
+        env_vars = v1.load_env()
+    database_url = env_vars.get('DATABASE_URL')
+
+    if not database_url:
+        print("❌ ERROR: No se encontró DATABASE_URL en .env")
+        exit(1)
+
+    print(f"\n✅ DATABASE_URL cargada correctamente")
+
+    # Cargar dataset de verbos (una sola lectura del CSV)
+    jehle_csv = '/home/ubuntu/jehle_verbs.csv'
+    print(f"\n📚 Cargando dataset de verbos desde {jehle_csv}...")
+    with span('load_jehle_verbs') as load_span:
+        verbs_dict, v2_verbs = load_jehle_datasets(jehle_csv)
+        load_span.rows_out = len(verbs_dict)
+    print(f"✅ Cargados {len(verbs_dict)} verbos únicos del dataset")
+
+    # Crear mapeo inglés -> español
+    with span('create_english_to_spanish_map', rows_in=len(v2_verbs)) as map_span:
+        eng_to_spa_map = v2.create_english_to_spanish_map(v2_verbs)
+        map_span.rows_out = len(eng_to_spa_map)
+    print(f"✅ Mapeo inglés -> español creado con {len(eng_to_spa_map)} verbos")
+    fuzzy_matcher = FuzzyVerbMatcher(eng_to_spa_map, threshold=args.fuzzy_threshold)
+
+    # Actualizar base de datos
+    print(f"\n🔄 Iniciando actualización de base de datos...")
+    updated, skipped, not_found_count, not_found_list = update_verbs_in_database(
+        verbs_dict, eng_to_spa_map, database_url, write_mode=args.writer, page_size=args.page_size,
+        stream=args.stream, itersize=args.itersize, chunk_size=args.chunk_size, resume=args.resume,
+        fuzzy_matcher=fuzzy_matcher if args.fuzzy else None,
+        pipeline=args.pipeline, queue_size=args.queue_size, workers=args.workers,
+        mirror=args.mirror, dry_run=args.dry_run
+    )
+
+    # Mantener al día las claves de búsqueda sin tildes
+    if not args.dry_run:
+        with span('search_keys'):
+            sync_search_keys_after_run(database_url, tables=('Verb',))
+
+    # Resumen
+    print("\n" + "=" * 70)
+    print("RESUMEN DE ACTUALIZACIÓN")
+    print("=" * 70)
+    print(f"✅ Verbos actualizados: {updated}")
+    print(f"⏭️  Verbos sin cambios: {skipped}")
+    print(f"⚠️  Verbos no encontrados: {not_found_count}")
+
+    if not_found_count > 0:
+        print(f"\nVerbos no encontrados guardados en: {NOT_FOUND_FILE}")
+        with open(NOT_FOUND_FILE, 'w') as f:
+            for verb in not_found_list:
+                f.write(f"{verb}\n")
+
+        # Candidatos aproximados para revisar a mano
+        start = time.perf_counter()
+        with_candidates = write_candidates_report(fuzzy_matcher, not_found_list, FUZZY_CANDIDATES_FILE)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"🔎 Candidatos aproximados para {with_candidates}/{not_found_count} verbos "
+              f"({elapsed_ms:.1f} ms) guardados en: {FUZZY_CANDIDATES_FILE}")
+
+    flush_metrics()
+    print("\n✅ Proceso completado!")
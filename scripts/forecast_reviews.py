@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Simulador de carga de repasos sobre el estado de "UserProgress"
+
+Antes de cambiar los parámetros de SM-2 o los objetivos diarios (User.dailyGoal)
+hay que saber cuántos repasos por día generará el sistema. El simulador carga
+"UserProgress" en arrays de NumPy y avanza día a día sobre toda la población:
+
+  1. los elementos con fecha de repaso <= hoy están pendientes; cada usuario
+     repasa como mucho dailyGoal * --reviews-per-goal-unit al día (los más
+     antiguos primero) y el resto se acumula para el día siguiente
+  2. cada repaso acierta o falla según la precisión de su cohorte: las filas se
+     agrupan por precisión histórica (correctCount / incorrectCount) y por
+     experiencia (número de respuestas), y la probabilidad de acierto de cada
+     cohorte es su precisión conjunta
+  3. se aplica SM-2 (sm2.review) a todos los repasos del día de una vez
+
+El resultado es la previsión diaria agregada (repasos, pendientes, fallos,
+usuarios activos, percentiles por usuario) y, opcionalmente, el total y el pico
+por usuario. No se modelan elementos nuevos: la previsión es la carga que genera
+el progreso existente.
+
+Requiere numpy, y psycopg2 para leer la base de datos (pip install -r
+scripts/requirements.txt); con --synthetic basta numpy.
+
+Uso:
+    python forecast_reviews.py --days 90
+    python forecast_reviews.py --days 60 --second-interval 4 --daily-goal 30
+    python forecast_reviews.py --synthetic 50000    # población sintética, sin base de datos
+"""
+import csv
+import time
+import argparse
+from datetime import datetime, timezone
+
+import numpy as np
+
+from instrumentation import span, add_instrumentation_arguments, configure_from_args, flush_metrics
+from sm2 import PROGRESS_COLUMNS, progress_arrays, review, scheduled_interval, add_sm2_arguments, params_from_args
+
+DEFAULT_DAYS = 90
+DEFAULT_REVIEWS_PER_GOAL_UNIT = 1.0
+DEFAULT_REQUESTS_PER_REVIEW = 2
+DEFAULT_ACTIVE_HOURS = 16
+DEFAULT_ITERSIZE = 50000
+
+# Cohortes: límites de precisión histórica y de número de respuestas
+ACCURACY_BINS = [0.5, 0.7, 0.85, 0.95]
+EXPERIENCE_BINS = [1, 5, 20]
+
+
+def load_population(database_url, itersize=DEFAULT_ITERSIZE):
+    """Lee "UserProgress" y los objetivos diarios de "User" a arrays"""
+    import psycopg2
+    from verb_db import iter_verb_chunks
+
+    conn = psycopg2.connect(database_url)
+    try:
+        chunks = [
+            progress_arrays(rows)
+            for rows in iter_verb_chunks(conn, PROGRESS_COLUMNS, itersize=itersize, table='UserProgress')
+        ]
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, "dailyGoal" FROM "User"')
+        goals = dict(cursor.fetchall())
+        cursor.close()
+        conn.commit()
+    finally:
+        conn.close()
+
+    if not chunks:
+        chunks = [progress_arrays([])]
+    arrays = {column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}
+
+    user_ids, user_index = np.unique(arrays['userId'].astype(str), return_inverse=True)
+    today = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), 'D')
+    due_day = (arrays['nextReviewDate'].astype('datetime64[D]') - today).astype(np.int64)
+    return {
+        'user_ids': user_ids,
+        'user': user_index,
+        'ease': arrays['easeFactor'],
+        'repetitions': arrays['repetitions'],
+        'interval': arrays['interval'],
+        'due_day': np.maximum(due_day, 0),
+        'correct': arrays['correctCount'],
+        'incorrect': arrays['incorrectCount'],
+        'daily_goal': np.array([goals.get(user_id, 50) for user_id in user_ids], dtype=np.int64),
+        'start_date': today,
+    }
+
+
+def synthetic_population(users, items_per_user, params, seed=0):
+    """Población inventada con la misma forma que load_population, para probar parámetros sin base de datos"""
+    rng = np.random.default_rng(seed)
+    rows = users * items_per_user
+    user = np.repeat(np.arange(users), items_per_user)
+    skill = rng.beta(8, 2, users)[user]
+    repetitions = rng.poisson(3, rows)
+    answers = repetitions + rng.poisson(2, rows)
+    correct = rng.binomial(answers, skill)
+    ease = np.clip(rng.normal(2.5, 0.25, rows), params.min_ease, None).round(2)
+    interval = scheduled_interval(repetitions, ease, params)
+    return {
+        'user_ids': np.array([f'user{index}' for index in range(users)]),
+        'user': user,
+        'ease': ease,
+        'repetitions': repetitions,
+        'interval': interval,
+        'due_day': rng.integers(0, interval + 1),
+        'correct': correct,
+        'incorrect': answers - correct,
+        'daily_goal': np.full(users, 50, dtype=np.int64),
+        'start_date': np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), 'D'),
+    }
+
+
+def cohort_accuracy(correct, incorrect):
+    """Probabilidad de acierto de cada fila: la precisión conjunta de su cohorte
+
+    Las filas sin respuestas forman su propia cohorte con la precisión global.
+    Devuelve (probabilidad por fila, cohorte por fila, probabilidad por cohorte).
+    """
+    answers = correct + incorrect
+    with np.errstate(invalid='ignore', divide='ignore'):
+        accuracy = np.where(answers > 0, correct / answers, 0)
+    accuracy_bin = np.digitize(accuracy, ACCURACY_BINS)
+    experience_bin = np.digitize(answers, EXPERIENCE_BINS)
+    cohort = accuracy_bin * (len(EXPERIENCE_BINS) + 1) + experience_bin
+    cohort[answers == 0] = -1
+    cohort += 1  # la cohorte 0 son las filas sin historial
+
+    cohorts = (len(ACCURACY_BINS) + 1) * (len(EXPERIENCE_BINS) + 1) + 1
+    cohort_correct = np.bincount(cohort, weights=correct, minlength=cohorts)
+    cohort_answers = np.bincount(cohort, weights=answers, minlength=cohorts)
+    overall = correct.sum() / answers.sum() if answers.sum() else 0.8
+    with np.errstate(invalid='ignore', divide='ignore'):
+        probability = np.where(cohort_answers > 0, cohort_correct / cohort_answers, overall)
+    probability[0] = overall
+    return probability[cohort], cohort, probability
+
+
+def _rank_within_user(user):
+    """Posición de cada elemento dentro de su usuario (user debe venir ordenado)"""
+    if not len(user):
+        return user
+    starts = np.flatnonzero(np.r_[True, user[1:] != user[:-1]])
+    lengths = np.diff(np.r_[starts, len(user)])
+    return np.arange(len(user)) - np.repeat(starts, lengths)
+
+
+def simulate(population, params, days=DEFAULT_DAYS, reviews_per_goal_unit=DEFAULT_REVIEWS_PER_GOAL_UNIT,
+             daily_goal=None, seed=0):
+    """Avanza `days` días sobre toda la población y devuelve (previsión diaria, totales por usuario)"""
+    rng = np.random.default_rng(seed)
+    user = population['user']
+    ease = population['ease'].astype(np.float64)
+    repetitions = population['repetitions'].astype(np.int64)
+    interval = population['interval'].astype(np.int64)
+    due_day = population['due_day'].astype(np.int64)
+    users = len(population['user_ids'])
+
+    goals = np.full(users, daily_goal) if daily_goal is not None else population['daily_goal']
+    cap = np.floor(goals * reviews_per_goal_unit).astype(np.int64) if reviews_per_goal_unit else None
+    success, _, _ = cohort_accuracy(population['correct'], population['incorrect'])
+
+    user_total = np.zeros(users, dtype=np.int64)
+    user_peak = np.zeros(users, dtype=np.int64)
+    forecast = []
+
+    for day in range(days):
+        due = np.flatnonzero(due_day <= day)
+        pending = len(due)
+        if cap is not None and pending:
+            # Los más antiguos primero, hasta el tope diario de cada usuario: una
+            # sola ordenación por la clave entera (usuario, día de vencimiento)
+            due_user = user[due]
+            due = due[np.argsort(due_user * days + due_day[due], kind='stable')]
+            due_user = user[due]
+            due = due[_rank_within_user(due_user) < cap[due_user]]
+
+        passed = rng.random(len(due)) < success[due]
+        quality = np.where(passed, params.quality_correct, params.quality_incorrect)
+        ease[due], repetitions[due], interval[due] = review(
+            ease[due], repetitions[due], interval[due], quality, params
+        )
+        due_day[due] = day + interval[due]
+
+        counts = np.bincount(user[due], minlength=users)
+        user_total += counts
+        np.maximum(user_peak, counts, out=user_peak)
+        active = counts[counts > 0]
+        forecast.append({
+            'day': day,
+            'date': str(population['start_date'] + day),
+            'reviews': len(due),
+            'due': pending,
+            'carried_over': pending - len(due),
+            'failed': int((~passed).sum()),
+            'active_users': len(active),
+            'p50_per_user': float(np.percentile(active, 50)) if len(active) else 0.0,
+            'p95_per_user': float(np.percentile(active, 95)) if len(active) else 0.0,
+            'max_per_user': int(active.max(initial=0)),
+        })
+
+    per_user = {'user_ids': population['user_ids'], 'total': user_total, 'peak': user_peak}
+    return forecast, per_user
+
+
+def print_forecast(forecast, requests_per_review=DEFAULT_REQUESTS_PER_REVIEW, active_hours=DEFAULT_ACTIVE_HOURS):
+    """Tabla diaria (semanal si son más de 31 días) y resumen de capacidad"""
+    step = 1 if len(forecast) <= 31 else 7
+    print(f"\n{'fecha':<12} {'repasos':>10} {'pendientes':>11} {'arrastrados':>11} {'fallos':>7} "
+          f"{'usuarios':>9} {'p95/usuario':>11} {'máx/usuario':>11}")
+    for start in range(0, len(forecast), step):
+        block = forecast[start:start + step]
+        peak = max(block, key=lambda day: day['reviews'])
+        label = block[0]['date'] if step == 1 else f"{block[0]['date']}+"
+        failed = sum(day['failed'] for day in block) / max(sum(day['reviews'] for day in block), 1) * 100
+        print(f"{label:<12} {peak['reviews']:>10,} {peak['due']:>11,} {peak['carried_over']:>11,} "
+              f"{failed:>6.1f}% {peak['active_users']:>9,} {peak['p95_per_user']:>11.1f} "
+              f"{peak['max_per_user']:>11,}")
+    if step > 1:
+        print("(una fila por semana: el día con más repasos de cada semana)")
+
+    reviews = np.array([day['reviews'] for day in forecast])
+    peak = forecast[int(reviews.argmax())]
+    requests = peak['reviews'] * requests_per_review
+    print(f"\n📈 Repasos/día: media {reviews.mean():,.0f}, p95 {np.percentile(reviews, 95):,.0f}, "
+          f"pico {peak['reviews']:,} ({peak['date']})")
+    print(f"🖥️  Pico de API: {requests:,} peticiones/día ≈ {requests / (active_hours * 3600):.1f} req/s "
+          f"repartidas en {active_hours} h ({requests_per_review} peticiones por repaso)")
+
+
+def write_forecast(forecast, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(forecast[0]))
+        writer.writeheader()
+        writer.writerows(forecast)
+
+
+def write_per_user(per_user, days, path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['userId', 'total_reviews', 'peak_day_reviews', 'mean_per_day'])
+        for user_id, total, peak in zip(per_user['user_ids'], per_user['total'], per_user['peak']):
+            writer.writerow([user_id, int(total), int(peak), round(total / days, 2)])
+
+
+# Main
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Previsión de repasos diarios con SM-2 sobre UserProgress')
+    add_sm2_arguments(parser)
+    add_instrumentation_arguments(parser)
+    parser.add_argument('--days', type=int, default=DEFAULT_DAYS, help='Días a simular')
+    parser.add_argument(
+        '--daily-goal', type=int, default=None,
+        help='Simular con este dailyGoal para todos los usuarios en lugar del guardado'
+    )
+    parser.add_argument(
+        '--reviews-per-goal-unit', type=float, default=DEFAULT_REVIEWS_PER_GOAL_UNIT,
+        help='Repasos diarios máximos por unidad de dailyGoal (0 = sin tope)'
+    )
+    parser.add_argument(
+        '--requests-per-review', type=int, default=DEFAULT_REQUESTS_PER_REVIEW,
+        help='Peticiones a la API (y a la base de datos) por repaso, para estimar la capacidad'
+    )
+    parser.add_argument(
+        '--active-hours', type=float, default=DEFAULT_ACTIVE_HOURS,
+        help='Horas del día en que se concentran los repasos'
+    )
+    parser.add_argument('--seed', type=int, default=0, help='Semilla aleatoria')
+    parser.add_argument('--output', default=None, help='Guardar la previsión diaria en CSV')
+    parser.add_argument('--per-user-output', default=None, help='Guardar el total y el pico por usuario en CSV')
+    parser.add_argument(
+        '--synthetic', type=int, metavar='USUARIOS', default=None,
+        help='Simular una población sintética de N usuarios en lugar de leer la base de datos'
+    )
+    parser.add_argument(
+        '--items-per-user', type=int, default=200,
+        help='Elementos por usuario de la población sintética'
+    )
+    args = parser.parse_args()
+    configure_from_args('forecast_reviews', args)
+    params = params_from_args(args)
+
+    print("=" * 60)
+    print("PREVISIÓN DE CARGA DE REPASOS")
+    print("=" * 60)
+    print(f"Parámetros: {params.as_dict()}")
+
+    start = time.perf_counter()
+    with span('load_population') as load_span:
+        if args.synthetic:
+            population = synthetic_population(args.synthetic, args.items_per_user, params, seed=args.seed)
+        else:
+            from fix_verb_translations import load_env
+            database_url = load_env().get('DATABASE_URL')
+            if not database_url:
+                print("❌ ERROR: No se encontró DATABASE_URL en .env")
+                exit(1)
+            population = load_population(database_url)
+        load_span.rows_out = len(population['user'])
+    print(f"✅ {len(population['user']):,} filas de progreso de {len(population['user_ids']):,} usuarios "
+          f"cargadas en {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    with span('simulate', rows_in=len(population['user'])):
+        forecast, per_user = simulate(
+            population, params, days=args.days, reviews_per_goal_unit=args.reviews_per_goal_unit,
+            daily_goal=args.daily_goal, seed=args.seed
+        )
+    print(f"⚡ {args.days} días simulados en {time.perf_counter() - start:.2f}s")
+
+    print_forecast(forecast, requests_per_review=args.requests_per_review, active_hours=args.active_hours)
+
+    if args.output:
+        write_forecast(forecast, args.output)
+        print(f"\nPrevisión diaria guardada en: {args.output}")
+    if args.per_user_output:
+        write_per_user(per_user, args.days, args.per_user_output)
+        print(f"Totales por usuario guardados en: {args.per_user_output}")
+
+    flush_metrics()
+    print("\n✅ Proceso completado!")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Coincidencia aproximada para los verbos ingleses que no están en el mapeo exacto
+
+Usa un índice de borrados al estilo SymSpell: para cada clave del mapeo
+inglés -> español se precalculan todas las variantes con hasta MAX_DISTANCE
+caracteres borrados (solo sobre los primeros PREFIX_LENGTH caracteres, para que
+el índice siga siendo pequeño). Una consulta genera sus propios borrados, los
+busca en el índice y solo verifica la distancia real de esos pocos candidatos,
+sin comparar la consulta con todas las claves.
+"""
+
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+# Puntuación mínima (1 - distancia / longitud) para aceptar un candidato sin revisión
+DEFAULT_THRESHOLD = 0.8
+
+
+def _deletes(word, max_distance):
+    """Todas las variantes de `word` con hasta max_distance caracteres borrados"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for term in frontier:
+            for i in range(len(term)):
+                variant = term[:i] + term[i + 1:]
+                if variant not in results:
+                    next_frontier.add(variant)
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a, b, max_distance):
+    """Distancia de Damerau-Levenshtein (transposiciones adyacentes) acotada
+
+    Devuelve max_distance + 1 en cuanto se sabe que la distancia la supera.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class FuzzyVerbMatcher:
+    """Candidatos aproximados sobre las claves de create_english_to_spanish_map"""
+
+    def __init__(self, eng_to_spa_map, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH,
+                 threshold=DEFAULT_THRESHOLD):
+        self.eng_to_spa_map = eng_to_spa_map
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.threshold = threshold
+        self._deletes = {}
+        for key in eng_to_spa_map:
+            for variant in _deletes(key[:prefix_length], max_distance):
+                self._deletes.setdefault(variant, []).append(key)
+
+    def candidates(self, query, k=3):
+        """Devuelve hasta k tuplas (infinitivo español, clave inglesa, puntuación)
+
+        Ordenadas por puntuación descendente; para una misma puntuación gana la
+        clave más corta y después el orden alfabético.
+        """
+        query = query.lower().strip()
+        keys = set()
+        for variant in _deletes(query[:self.prefix_length], self.max_distance):
+            keys.update(self._deletes.get(variant, ()))
+
+        scored = []
+        for key in keys:
+            distance = edit_distance(query, key, self.max_distance)
+            if distance > self.max_distance:
+                continue
+            score = 1 - distance / max(len(query), len(key))
+            scored.append((-score, len(key), key))
+
+        scored.sort()
+        return [
+            (self.eng_to_spa_map[key]['spanish'], key, round(-neg_score, 3))
+            for neg_score, _, key in scored[:k]
+        ]
+
+    def accept(self, query):
+        """Devuelve la info del mejor candidato si supera el umbral y no hay empate, o None"""
+        best = self.candidates(query, k=2)
+        if not best or best[0][2] < self.threshold:
+            return None
+        if len(best) > 1 and best[1][2] == best[0][2] and best[1][0] != best[0][0]:
+            return None
+        return self.eng_to_spa_map[best[0][1]]
+
+
+def write_candidates_report(matcher, not_found, output_file, k=3):
+    """Guarda los k mejores candidatos de cada verbo no encontrado
+
+    Formato por línea: verbo<TAB>español (clave inglesa, puntuación); ...
+    Devuelve el número de verbos con al menos un candidato.
+    """
+    with_candidates = 0
+    with open(output_file, 'w') as f:
+        for verb in not_found:
+            candidates = matcher.candidates(verb, k=k)
+            if candidates:
+                with_candidates += 1
+            formatted = '; '.join(f"{spanish} ({key}, {score})" for spanish, key, score in candidates)
+            f.write(f"{verb}\t{formatted}\n")
+    return with_candidates
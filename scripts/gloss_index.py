@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Índice invertido inglés -> español construido con todas las glosas de Jehle
+
+El campo infinitive_english de Jehle puede traer varias glosas, p. ej.
+"to leave, go out" (salir) o "to assure, guarantee; to ensure" (asegurar).
+Cada glosa se normaliza (sin "to " inicial, sin paréntesis, en minúsculas) y
+se indexa como frase completa y por sus palabras, con una regla de ranking
+para las claves que comparten varios verbos españoles.
+"""
+import re
+
+# Tipos de coincidencia, de mejor a peor
+MATCH_PHRASE = 0   # la glosa completa: "go out"
+MATCH_HEAD = 1     # primera palabra de una glosa de varias palabras: "go"
+MATCH_TOKEN = 2    # cualquier otra palabra con contenido: "out"
+
+STOPWORDS = {
+    'a', 'an', 'the', 'to', 'of', 'for', 'with', 'in', 'on', 'at', 'by', 'from',
+    'oneself', 'one', "one's", 'someone', 'something', 'sb', 'sth', 'be', 'or', 'and',
+}
+
+_PARENTHESES = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_LEADING_TO = re.compile(r'^to\s+')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_gloss(text):
+    """Normaliza una glosa o una consulta: minúsculas, sin "to " inicial ni paréntesis"""
+    text = _PARENTHESES.sub(' ', text.lower())
+    text = _SPACES.sub(' ', text).strip(' .!?"\'')
+    return _LEADING_TO.sub('', text)
+
+
+def parse_glosses(infinitive_english):
+    """Divide infinitive_english en glosas normalizadas, en el orden del dataset"""
+    glosses = []
+    for part in re.split(r'[;,/]', infinitive_english):
+        gloss = normalize_gloss(part)
+        if gloss and gloss not in glosses:
+            glosses.append(gloss)
+    return glosses
+
+
+class GlossIndex:
+    """Índice invertido de glosas inglesas a infinitivos españoles
+
+    Ranking de candidatos para una misma clave (menor es mejor):
+      1. tipo de coincidencia (frase completa > primera palabra > otra palabra)
+      2. posición de la glosa en infinitive_english (la primera es la principal)
+      3. verbos no reflexivos antes que los reflexivos (-se)
+      4. número de glosas del verbo (menos glosas = significado más específico)
+      5. orden alfabético, para que el resultado sea determinista
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._ranked = {}
+
+    @classmethod
+    def from_verbs(cls, verbs_dict):
+        """Construye el índice a partir de un verbs_dict con claves 'spanish' y 'english'"""
+        index = cls()
+        for info in verbs_dict.values():
+            index.add(info['spanish'], info['english'])
+        index.finalize()
+        return index
+
+    def add(self, spanish, infinitive_english):
+        glosses = parse_glosses(infinitive_english)
+        reflexive = 1 if spanish.endswith('se') else 0
+
+        for position, gloss in enumerate(glosses):
+            self._add_key(gloss, (MATCH_PHRASE, position, reflexive, len(glosses), spanish))
+
+            words = gloss.split()
+            if len(words) > 1:
+                self._add_key(words[0], (MATCH_HEAD, position, reflexive, len(glosses), spanish))
+                for word in words[1:]:
+                    if word not in STOPWORDS:
+                        self._add_key(word, (MATCH_TOKEN, position, reflexive, len(glosses), spanish))
+
+    def _add_key(self, key, rank):
+        self._entries.setdefault(key, []).append(rank)
+
+    def finalize(self):
+        """Ordena los candidatos de cada clave una sola vez (sin duplicados por verbo)"""
+        self._ranked = {}
+        for key, ranks in self._entries.items():
+            seen = set()
+            ranked = []
+            for rank in sorted(ranks):
+                spanish = rank[-1]
+                if spanish not in seen:
+                    seen.add(spanish)
+                    ranked.append((spanish, rank[0]))
+            self._ranked[key] = ranked
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._ranked)
+
+    def __contains__(self, query):
+        return normalize_gloss(query) in self._ranked
+
+    def keys(self):
+        return self._ranked.keys()
+
+    def candidates(self, query, k=None):
+        """Devuelve [(infinitivo español, tipo de coincidencia), ...] ordenados por ranking"""
+        ranked = self._ranked.get(normalize_gloss(query), [])
+        return ranked if k is None else ranked[:k]
+
+    def best(self, query):
+        """Mejor infinitivo español para la consulta, o None"""
+        ranked = self._ranked.get(normalize_gloss(query))
+        return ranked[0][0] if ranked else None
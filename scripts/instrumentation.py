@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Medición por fases de los scripts de corrección
+
+Cada fase se envuelve en un span:
+
+    with span('load_jehle_verbs') as s:
+        verbs_dict = load_jehle_verbs(csv_path)
+        s.rows_out = len(verbs_dict)
+
+Un span mide tiempo real, tiempo de CPU del hilo, filas de entrada y salida y el
+pico de memoria (tracemalloc; null en los spans de hilos de trabajo, porque el
+pico es del proceso entero). Los spans con el mismo nombre (p. ej. un SELECT por
+bloque) se acumulan y, al cerrar, se escribe una línea JSON por fase en el fichero
+de métricas, que se abre en modo append para poder comparar ejecuciones.
+Opcionalmente las fases de primer nivel se perfilan con cProfile (un fichero
+.prof por fase, acumulando todas sus llamadas).
+
+Mientras no se llame a configure() los spans no hacen nada.
+"""
+import os
+import json
+import time
+import uuid
+import cProfile
+import threading
+import tracemalloc
+from datetime import datetime, timezone
+
+
+class Span:
+    """Una fase en curso; rows_in y rows_out pueden asignarse dentro del bloque with"""
+
+    def __init__(self, recorder, name, rows_in=None):
+        self.recorder = recorder
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.peak_memory = 0
+        self.profiler = None
+
+    def __enter__(self):
+        self.recorder._start(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder._finish(self)
+        return False
+
+
+class _NullSpan:
+    """Span que no mide nada (instrumentación desactivada)"""
+    rows_in = None
+    rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Recorder:
+    """Acumula los spans de una ejecución y los vuelca como JSON lines"""
+
+    def __init__(self, script, output_path, profile_dir=None, trace_memory=True):
+        self.script = script
+        self.output_path = output_path
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.phases = {}
+        self.profilers = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _measures_memory(self):
+        # tracemalloc tiene un único pico para todo el proceso: solo el hilo
+        # principal lo reinicia y lo lee. Los spans de los hilos de trabajo
+        # (--workers) registran null, igual que quedan fuera de cProfile
+        return self.trace_memory and threading.current_thread() is threading.main_thread()
+
+    def _start(self, span):
+        stack = self._stack()
+        if not self._measures_memory():
+            span.peak_memory = None
+        else:
+            # El pico se reinicia por span: antes se guarda el del span padre
+            current_peak = tracemalloc.get_traced_memory()[1]
+            if stack:
+                stack[-1].peak_memory = max(stack[-1].peak_memory, current_peak)
+            tracemalloc.reset_peak()
+        # cProfile solo admite un perfilador activo: se perfilan las fases de primer nivel
+        if self.profile_dir and not stack and threading.current_thread() is threading.main_thread():
+            span.profiler = self.profilers.setdefault(span.name, cProfile.Profile())
+            span.profiler.enable()
+        stack.append(span)
+        span.wall_start = time.perf_counter()
+        span.cpu_start = time.thread_time()
+
+    def _finish(self, span):
+        wall = time.perf_counter() - span.wall_start
+        cpu = time.thread_time() - span.cpu_start
+        stack = self._stack()
+        stack.pop()
+
+        if span.peak_memory is not None:
+            span.peak_memory = max(span.peak_memory, tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1].peak_memory = max(stack[-1].peak_memory, span.peak_memory)
+
+        if span.profiler:
+            span.profiler.disable()
+
+        with self._lock:
+            phase = self.phases.setdefault(span.name, {
+                'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows_in': 0, 'rows_out': 0, 'peak_memory_bytes': None,
+            })
+            phase['calls'] += 1
+            phase['wall_s'] += wall
+            phase['cpu_s'] += cpu
+            phase['rows_in'] += span.rows_in or 0
+            phase['rows_out'] += span.rows_out or 0
+            if span.peak_memory is not None:
+                phase['peak_memory_bytes'] = max(phase['peak_memory_bytes'] or 0, span.peak_memory)
+
+    def close(self):
+        """Escribe una línea JSON por fase y devuelve el resumen"""
+        with open(self.output_path, 'a') as f:
+            for name, phase in self.phases.items():
+                record = {
+                    'run_id': self.run_id,
+                    'script': self.script,
+                    'started_at': self.started_at,
+                    'phase': name,
+                    **phase,
+                    'wall_s': round(phase['wall_s'], 6),
+                    'cpu_s': round(phase['cpu_s'], 6),
+                }
+                f.write(json.dumps(record) + '\n')
+        for name, profiler in self.profilers.items():
+            profiler.dump_stats(os.path.join(self.profile_dir, f'{self.run_id}_{name}.prof'))
+        if self.trace_memory:
+            tracemalloc.stop()
+        return self.phases
+
+
+_recorder = None
+
+
+def configure(script, output_path, profile_dir=None, trace_memory=True):
+    """Activa la medición para esta ejecución"""
+    global _recorder
+    _recorder = Recorder(script, output_path, profile_dir=profile_dir, trace_memory=trace_memory)
+    return _recorder
+
+
+def span(name, rows_in=None):
+    """Context manager que mide una fase (no hace nada si no se ha llamado a configure)"""
+    if _recorder is None:
+        return _NULL_SPAN
+    return Span(_recorder, name, rows_in)
+
+
+def flush_metrics():
+    """Vuelca las métricas acumuladas e imprime un resumen por fase"""
+    global _recorder
+    if _recorder is None:
+        return None
+    recorder, _recorder = _recorder, None
+    phases = recorder.close()
+
+    print(f"\n📈 Métricas por fase (ejecución {recorder.run_id}, guardadas en {recorder.output_path}):")
+    for name, phase in sorted(phases.items(), key=lambda item: -item[1]['wall_s']):
+        peak = phase['peak_memory_bytes']
+        peak = f"{peak / 1024 / 1024:7.1f} MB" if peak is not None else '    n/d   '
+        print(f"   {name:<32} {phase['wall_s']:8.3f}s real {phase['cpu_s']:8.3f}s CPU "
+              f"{phase['rows_in']:>8} → {phase['rows_out']:<8} filas "
+              f"{peak} pico ({phase['calls']} llamadas)")
+    return phases
+
+
+def add_instrumentation_arguments(parser):
+    """Añade las opciones de medición a un ArgumentParser"""
+    parser.add_argument(
+        '--metrics', metavar='FICHERO', default=None,
+        help='Medir cada fase (tiempo, CPU, filas, memoria) y añadir el resultado como JSON lines'
+    )
+    parser.add_argument(
+        '--profile-dir', metavar='DIR', default=None,
+        help='Guardar además un perfil de cProfile por fase (requiere --metrics)'
+    )
+    return parser
+
+
+def configure_from_args(script, args):
+    """Activa la medición si se pasó --metrics"""
+    if args.metrics:
+        configure(script, args.metrics, profile_dir=args.profile_dir)
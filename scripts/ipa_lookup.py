@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Búsqueda de pronunciaciones IPA sobre data/ipa_dict.json sin cargarlo en memoria
+
+A pesar de la extensión, data/ipa_dict.json es una lista "palabra<TAB>IPA" por
+línea, ordenada casi por completo (salvo unas pocas líneas con apóstrofos).
+El fichero se mapea en memoria y se construye una sola vez un índice compacto:
+
+  - un offset cada BLOCK_SIZE líneas de la secuencia ordenada (índice disperso)
+  - las pocas líneas fuera de orden, en un diccionario aparte
+
+Una consulta hace búsqueda binaria sobre el índice disperso y recorre como mucho
+un bloque del mmap. El índice se guarda en scripts/.cache y solo se reconstruye
+cuando cambia el fichero.
+"""
+import os
+import mmap
+import pickle
+from array import array
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IPA_DICT_PATH = os.path.join(ROOT_DIR, 'data', 'ipa_dict.json')
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+BLOCK_SIZE = 32
+INDEX_FORMAT_VERSION = 1
+
+
+def first_ipa(ipa):
+    """Primera pronunciación de una entrada como "/ˈbi/, /bi/" -> "/ˈbi/\""""
+    return ipa.split(',')[0].strip()
+
+
+class IpaLookup:
+    """Diccionario palabra -> IPA respaldado por mmap y un índice disperso de offsets"""
+
+    def __init__(self, path=IPA_DICT_PATH, cache_dir=CACHE_DIR):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.block_offsets, self.out_of_order = self._load_index(cache_dir)
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Índice
+
+    def _build_index(self):
+        """Recorre el fichero una vez y separa la secuencia ordenada de las excepciones"""
+        block_offsets = array('I')
+        out_of_order = {}
+        data = self._mmap
+        position = 0
+        size = len(data)
+        sorted_lines = 0
+        max_key = b''
+
+        while position < size:
+            end = data.find(b'\n', position)
+            if end == -1:
+                end = size
+            tab = data.find(b'\t', position, end)
+            if tab != -1:
+                key = data[position:tab]
+                if key < max_key:
+                    out_of_order[key] = data[tab + 1:end].decode('utf-8')
+                else:
+                    if sorted_lines % BLOCK_SIZE == 0:
+                        block_offsets.append(position)
+                    sorted_lines += 1
+                    max_key = key
+            position = end + 1
+
+        return block_offsets, out_of_order
+
+    def _load_index(self, cache_dir):
+        stat = os.stat(self.path)
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        cache_path = os.path.join(cache_dir, f'{name}.ipa_index.pkl')
+        source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    payload = pickle.load(f)
+                if payload.get('version') == INDEX_FORMAT_VERSION and payload.get('source') == source:
+                    return payload['block_offsets'], payload['out_of_order']
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+
+        block_offsets, out_of_order = self._build_index()
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                'version': INDEX_FORMAT_VERSION,
+                'source': source,
+                'block_offsets': block_offsets,
+                'out_of_order': out_of_order,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return block_offsets, out_of_order
+
+    # Consultas
+
+    def _key_at(self, offset):
+        return self._mmap[offset:self._mmap.find(b'\t', offset)]
+
+    def _find_block(self, key, lo=0):
+        """Índice del bloque cuya primera clave es <= key"""
+        offsets = self.block_offsets
+        hi = len(offsets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key < self._key_at(offsets[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        return max(lo - 1, 0)
+
+    def _scan_block(self, key, block):
+        """Busca key desde el inicio del bloque; para en la primera clave mayor"""
+        data = self._mmap
+        position = self.block_offsets[block]
+        end_of_block = (self.block_offsets[block + 1] if block + 1 < len(self.block_offsets)
+                        else len(data))
+
+        while position < end_of_block:
+            end = data.find(b'\n', position)
+            if end == -1:
+                end = len(data)
+            tab = data.find(b'\t', position, end)
+            if tab != -1:
+                line_key = data[position:tab]
+                if line_key == key:
+                    return data[tab + 1:end].decode('utf-8')
+                # Las líneas fuera de orden son menores que alguna clave anterior,
+                # así que una clave mayor siempre indica que ya no está en el bloque
+                if line_key > key:
+                    return None
+            position = end + 1
+        return None
+
+    def get(self, word, default=None):
+        """IPA de una palabra (en minúsculas, como en el diccionario) o default"""
+        key = word.lower().strip().encode('utf-8')
+        if key in self.out_of_order:
+            return self.out_of_order[key]
+        if not self.block_offsets:
+            return default
+        result = self._scan_block(key, self._find_block(key))
+        return default if result is None else result
+
+    def __getitem__(self, word):
+        result = self.get(word)
+        if result is None:
+            raise KeyError(word)
+        return result
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def get_many(self, words):
+        """Resuelve un lote de palabras en una sola pasada ordenada (merge-walk)
+
+        Las consultas se ordenan y cada búsqueda binaria empieza en el bloque de
+        la consulta anterior, así que el recorrido del fichero solo avanza.
+        Devuelve {palabra: IPA} solo para las palabras encontradas.
+        """
+        results = {}
+        queries = sorted({(word.lower().strip().encode('utf-8'), word) for word in words})
+        block = 0
+
+        for key, word in queries:
+            if key in self.out_of_order:
+                results[word] = self.out_of_order[key]
+                continue
+            if not self.block_offsets:
+                break
+            block = self._find_block(key, lo=block)
+            ipa = self._scan_block(key, block)
+            if ipa is not None:
+                results[word] = ipa
+
+        return results
+
+    def phrase_ipa(self, phrase):
+        """IPA de una frase ("give up") uniendo la primera pronunciación de cada palabra
+
+        Devuelve None si alguna palabra no está en el diccionario.
+        """
+        words = phrase.lower().split()
+        if len(words) == 1:
+            ipa = self.get(words[0])
+            return first_ipa(ipa) if ipa else None
+        found = self.get_many(words)
+        if len(found) < len(set(words)):
+            return None
+        return '/' + ' '.join(first_ipa(found[word]).strip('/') for word in words) + '/'
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Almacén compacto de todas las conjugaciones del dataset de verbos de Jehle
+
+En lugar de diccionarios anidados, cada forma conjugada se guarda como un id de
+cadena en un único array plano indexado por (verbo, modo, tiempo, persona):
+
+    forms[((verbo * n_modos + modo) * n_tiempos + tiempo) * 6 + persona]
+
+Las cadenas se internan en una sola tabla (el id 0 es la cadena vacía, es decir,
+"forma inexistente"), y modos, tiempos y personas se codifican como enteros.
+Cualquier forma se consulta en O(1) y el dataset completo ocupa pocos MB.
+
+load_conjugation_store() guarda el almacén ya construido en una caché binaria
+(pickle con versión de formato) y solo vuelve a leer el CSV cuando cambia.
+"""
+import os
+import csv
+import sys
+import pickle
+import hashlib
+from array import array
+
+PERSONS = ('1s', '2s', '3s', '1p', '2p', '3p')
+PERSON_CODES = {person: code for code, person in enumerate(PERSONS)}
+
+# Subir la versión cada vez que cambie la estructura de ConjugationStore
+CACHE_FORMAT_VERSION = 1
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+class ConjugationStore:
+    """Conjugaciones de Jehle en arrays planos con cadenas internadas"""
+
+    def __init__(self):
+        self.strings = ['']
+        self.infinitives = []
+        self.verb_codes = {}
+        self.moods = []
+        self.mood_codes = {}
+        self.tenses = []
+        self.tense_codes = {}
+        self.english_ids = array('I')
+        self.gerund_ids = array('I')
+        self.participle_ids = array('I')
+        self.forms = array('I')
+
+    @classmethod
+    def from_csv(cls, csv_path):
+        """Construye el almacén leyendo el CSV de Jehle una sola vez"""
+        store = cls()
+        string_ids = {'': 0}
+
+        def intern(text):
+            text = text.strip()
+            string_id = string_ids.get(text)
+            if string_id is None:
+                string_id = len(store.strings)
+                string_ids[text] = string_id
+                store.strings.append(sys.intern(text))
+            return string_id
+
+        # Primera fase: filas ya codificadas. Las dimensiones finales de modos y
+        # tiempos solo se conocen al terminar de leer el CSV.
+        coded_rows = []
+        with open(csv_path, 'r', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            col = {name: i for i, name in enumerate(header)}
+            form_cols = [col[f'form_{person}'] for person in PERSONS]
+
+            for row in reader:
+                infinitive = row[col['infinitive']].lower().strip()
+                verb = store.verb_codes.get(infinitive)
+                if verb is None:
+                    verb = len(store.infinitives)
+                    store.verb_codes[infinitive] = verb
+                    store.infinitives.append(sys.intern(infinitive))
+                    store.english_ids.append(intern(row[col['infinitive_english']]))
+                    store.gerund_ids.append(intern(row[col['gerund']]))
+                    store.participle_ids.append(intern(row[col['pastparticiple']]))
+
+                mood = store._code(store.moods, store.mood_codes, row[col['mood_english']])
+                tense = store._code(store.tenses, store.tense_codes, row[col['tense_english']])
+                coded_rows.append((verb, mood, tense, [intern(row[i]) for i in form_cols]))
+
+        # Segunda fase: array denso con todas las formas
+        store.forms = array('I', [0]) * (len(store.infinitives) * store._slots_per_verb())
+        # En orden inverso para que gane la primera fila de cada (verbo, modo, tiempo)
+        for verb, mood, tense, form_ids in reversed(coded_rows):
+            base = store._offset(verb, mood, tense)
+            store.forms[base:base + len(PERSONS)] = array('I', form_ids)
+
+        return store
+
+    @staticmethod
+    def _code(names, codes, name):
+        name = name.strip()
+        code = codes.get(name)
+        if code is None:
+            code = len(names)
+            codes[name] = code
+            names.append(sys.intern(name))
+        return code
+
+    def _slots_per_verb(self):
+        return len(self.moods) * len(self.tenses) * len(PERSONS)
+
+    def _offset(self, verb, mood, tense):
+        return ((verb * len(self.moods) + mood) * len(self.tenses) + tense) * len(PERSONS)
+
+    def __len__(self):
+        return len(self.infinitives)
+
+    def __contains__(self, infinitive):
+        return infinitive in self.verb_codes
+
+    def lookup(self, infinitive, mood, tense, person):
+        """Devuelve la forma conjugada ('' si no existe)
+
+        mood y tense son los nombres en inglés del dataset (p. ej. 'Indicative',
+        'Preterite'); person es '1s', '2s', '3s', '1p', '2p' o '3p'.
+        """
+        verb = self.verb_codes.get(infinitive)
+        mood_code = self.mood_codes.get(mood)
+        tense_code = self.tense_codes.get(tense)
+        if verb is None or mood_code is None or tense_code is None:
+            return ''
+        return self.strings[self.forms[self._offset(verb, mood_code, tense_code) + PERSON_CODES[person]]]
+
+    def english(self, infinitive):
+        """Traducción inglesa del infinitivo tal como aparece en el dataset"""
+        return self.strings[self.english_ids[self.verb_codes[infinitive]]]
+
+    def gerund(self, infinitive):
+        return self.strings[self.gerund_ids[self.verb_codes[infinitive]]]
+
+    def past_participle(self, infinitive):
+        return self.strings[self.participle_ids[self.verb_codes[infinitive]]]
+
+    def nbytes(self):
+        """Tamaño aproximado de los arrays y la tabla de cadenas"""
+        arrays = (self.forms, self.english_ids, self.gerund_ids, self.participle_ids)
+        total = sum(a.itemsize * len(a) for a in arrays)
+        total += sum(sys.getsizeof(text) for text in self.strings)
+        return total
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_path(csv_path, cache_dir):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f'{name}.conjugations.pkl')
+
+
+def load_conjugation_store(csv_path, cache_dir=CACHE_DIR, use_cache=True):
+    """Devuelve el ConjugationStore del CSV, usando la caché binaria si sigue siendo válida
+
+    La caché se invalida si cambia la versión de formato o el CSV de origen.
+    Tamaño y mtime se comprueban primero; si no coinciden (p. ej. el fichero se
+    copió o se tocó) se compara el hash SHA-256 antes de volver a parsear.
+    """
+    if not use_cache:
+        return ConjugationStore.from_csv(csv_path)
+
+    stat = os.stat(csv_path)
+    cache_path = _cache_path(csv_path, cache_dir)
+    source_hash = None
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            payload = None
+
+        if payload and payload.get('version') == CACHE_FORMAT_VERSION:
+            source = payload['source']
+            if source['size'] == stat.st_size and source['mtime_ns'] == stat.st_mtime_ns:
+                return payload['store']
+            if source['size'] == stat.st_size:
+                source_hash = _file_sha256(csv_path)
+                if source_hash == source['sha256']:
+                    _write_cache(cache_path, payload['store'], stat, source_hash)
+                    return payload['store']
+
+    store = ConjugationStore.from_csv(csv_path)
+    _write_cache(cache_path, store, stat, source_hash or _file_sha256(csv_path))
+    return store
+
+
+def _write_cache(cache_path, store, stat, source_hash):
+    """Escribe la caché de forma atómica (fichero temporal + rename)"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    payload = {
+        'version': CACHE_FORMAT_VERSION,
+        'source': {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': source_hash,
+        },
+        'store': store,
+    }
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Script para consolidar los ficheros de verbos de data/ en un único fichero canónico
+
+data/ tiene varias versiones solapadas de los mismos verbos (verbs_data.json,
+su copia verbs_data_temp.json, expanded_verbs_data.json y
+final_expanded_verbs_data.json). Este script:
+
+  - lee cada fichero de forma incremental, registro a registro, sin cargarlo entero
+  - deduplica por infinitivo usando un hash del contenido de cada registro
+  - resuelve los conflictos campo a campo con reglas de precedencia explícitas
+  - escribe data/verbs_canonical.json
+
+Reglas de precedencia:
+  1. Las fuentes se procesan en el orden indicado; la primera tiene prioridad.
+  2. Un valor de una fuente prioritaria solo se reemplaza si es un marcador de
+     posición: vacío, traducción "(traducir)" o igual al infinitivo, IPA "/verbo/"
+     o audio de la API de demostración.
+  3. Los campos que la fuente prioritaria no tiene (p. ej. examples) se toman de
+     la primera fuente que los tenga.
+
+Cada fichero de origen se identifica por su SHA-256: los ficheros idénticos a
+otro ya procesado se saltan. De cada fichero parseado se guarda en caché solo su
+resumen (infinitivo, hash de cada registro), no los registros: en ejecuciones
+posteriores, un fichero sin cambios cuyos registros ya se han consolidado
+idénticos desde una fuente anterior se salta sin volver a parsearlo.
+"""
+import os
+import json
+import pickle
+import hashlib
+import argparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, 'data')
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'verb_sources')
+MANIFEST_PATH = os.path.join(CACHE_DIR, 'manifest.json')
+
+DEFAULT_SOURCES = [
+    'verbs_data.json',
+    'verbs_data_temp.json',
+    'final_expanded_verbs_data.json',
+    'expanded_verbs_data.json',
+    'verb_data.json',
+]
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, 'verbs_canonical.json')
+
+CACHE_FORMAT_VERSION = 2
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def record_hash(record):
+    """Hash estable del contenido de un registro (JSON canónico)"""
+    canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+# Lectura incremental
+def iter_json_array(path, chunk_size=READ_CHUNK_SIZE):
+    """Devuelve uno a uno los elementos de un array JSON leyendo el fichero por bloques
+
+    Solo mantiene en memoria el bloque actual y el elemento que se está decodificando.
+    Un fichero vacío se trata como un array vacío.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer:
+            return
+        if not buffer.startswith('['):
+            raise ValueError(f"{path} no contiene un array JSON")
+        buffer = buffer[1:]
+        eof = False
+
+        while True:
+            buffer = buffer.lstrip().lstrip(',').lstrip()
+            if buffer.startswith(']'):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            yield item
+            buffer = buffer[end:]
+            if len(buffer) < chunk_size and not eof:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+
+# Reglas de precedencia
+def is_placeholder(field, value, infinitive):
+    """Indica si un valor es un marcador de posición que cualquier otra fuente puede reemplazar"""
+    if value is None or value == '' or value == [] or value == {}:
+        return True
+    if field == 'spanish_translation':
+        return '(traducir)' in value or value.strip().lower() == infinitive
+    if field == 'ipa':
+        return value.strip('/').lower() == infinitive
+    if field == 'audio_url':
+        return 'key=demo' in value
+    return False
+
+
+def merge_records(current, incoming, infinitive):
+    """Combina dos registros del mismo verbo; `current` viene de una fuente prioritaria"""
+    merged = dict(current)
+    for field, value in incoming.items():
+        existing = merged.get(field)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            merged[field] = merge_records(existing, value, infinitive)
+        elif is_placeholder(field, existing, infinitive) and not is_placeholder(field, value, infinitive):
+            merged[field] = value
+    return merged
+
+# Caché por fichero
+def load_source_digest(sha256):
+    """Resumen [(clave, hash), ...] de un fichero ya procesado, o None si no está en la caché"""
+    cache_path = os.path.join(CACHE_DIR, f'{sha256}.pkl')
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if payload.get('version') != CACHE_FORMAT_VERSION:
+        return None
+    return payload['digest']
+
+
+def save_source_digest(sha256, digest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_path = os.path.join(CACHE_DIR, f'{sha256}.pkl')
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': CACHE_FORMAT_VERSION, 'digest': digest}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, 'r') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+# Consolidación
+def merge_verb_files(source_paths, output_path, force=False):
+    """Consolida los ficheros de origen en output_path y devuelve las estadísticas"""
+    hashes = {path: file_sha256(path) for path in source_paths if os.path.exists(path)}
+    manifest = load_manifest()
+
+    if (not force and os.path.exists(output_path)
+            and manifest.get('sources') == hashes
+            and manifest.get('output') == file_sha256(output_path)):
+        print("✅ Ningún fichero ha cambiado desde la última consolidación")
+        return None
+
+    merged = {}
+    seen_hashes = {}
+    seen_files = {}
+    stats = {'files': 0, 'cached_files': 0, 'duplicate_files': 0, 'records': 0,
+             'duplicate_records': 0, 'merged_records': 0}
+
+    for path in source_paths:
+        name = os.path.basename(path)
+        if path not in hashes:
+            print(f"⚠️  {name}: no existe, se omite")
+            continue
+
+        sha256 = hashes[path]
+        if sha256 in seen_files:
+            print(f"⏭️  {name}: idéntico a {seen_files[sha256]}, se omite")
+            stats['duplicate_files'] += 1
+            continue
+        seen_files[sha256] = name
+
+        # Si el resumen en caché muestra que todos sus registros ya se han
+        # consolidado idénticos, el fichero no se vuelve a parsear
+        digest = load_source_digest(sha256)
+        if digest is not None and all(content_hash in seen_hashes.get(key, ())
+                                      for key, content_hash in digest):
+            stats['files'] += 1
+            stats['cached_files'] += 1
+            stats['records'] += len(digest)
+            stats['duplicate_records'] += len(digest)
+            print(f"📚 {name}: {len(digest)} registros (caché, sin cambios que aportar)")
+            continue
+
+        digest = []
+        for record in iter_json_array(path):
+            key = record['infinitive'].lower().strip()
+            content_hash = record_hash(record)
+            digest.append((key, content_hash))
+            stats['records'] += 1
+            if key not in merged:
+                merged[key] = record
+                seen_hashes[key] = {content_hash}
+            elif content_hash in seen_hashes[key]:
+                stats['duplicate_records'] += 1
+            else:
+                merged[key] = merge_records(merged[key], record, key)
+                seen_hashes[key].add(content_hash)
+                stats['merged_records'] += 1
+        save_source_digest(sha256, digest)
+        stats['files'] += 1
+        print(f"📚 {name}: {len(digest)} registros")
+
+    # Escribir registro a registro, en orden de primera aparición
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for i, record in enumerate(merged.values()):
+            if i:
+                f.write(',\n')
+            f.write('  ' + json.dumps(record, ensure_ascii=False))
+        f.write('\n]\n')
+    os.replace(tmp_path, output_path)
+
+    save_manifest({'sources': hashes, 'output': file_sha256(output_path)})
+    stats['verbs'] = len(merged)
+    return stats
+
+# Main
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Consolida los ficheros de verbos de data/ en uno canónico')
+    parser.add_argument(
+        'sources', nargs='*',
+        help='Ficheros de origen en orden de prioridad (por defecto los de data/)'
+    )
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Fichero canónico de salida')
+    parser.add_argument('--force', action='store_true', help='Consolidar aunque nada haya cambiado')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CONSOLIDACIÓN DE FICHEROS DE VERBOS")
+    print("=" * 60)
+
+    sources = args.sources or [os.path.join(DATA_DIR, name) for name in DEFAULT_SOURCES]
+    stats = merge_verb_files(sources, args.output, force=args.force)
+
+    if stats:
+        print(f"\n✅ {stats['verbs']} verbos únicos guardados en {args.output}")
+        print(f"   Ficheros procesados: {stats['files']} ({stats['cached_files']} desde caché, "
+              f"{stats['duplicate_files']} duplicados omitidos)")
+        print(f"   Registros leídos: {stats['records']} ({stats['duplicate_records']} idénticos, "
+              f"{stats['merged_records']} combinados campo a campo)")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Replanificación en bloque de "UserProgress" con SM-2 vectorizado
+
+Recorre "UserProgress" por bloques (mismo lector que los scripts de verbos:
+cursor server-side, o páginas con commit y checkpoint con --chunk-size),
+convierte cada bloque en arrays de NumPy y recalcula easeFactor, interval y
+nextReviewDate con los parámetros indicados (sm2.py). Solo las filas que cambian
+se escriben, en bloque (COPY + UPDATE ... FROM por defecto).
+
+Sirve para migrar los calendarios tras cambiar los parámetros de SM-2 (p. ej.
+--second-interval 4 o --max-interval 180) y, con --reestimate-ease, para
+reconstruir el easeFactor de cada fila a partir de sus aciertos y fallos.
+
+Requiere psycopg2 y numpy (pip install -r scripts/requirements.txt).
+
+Uso:
+    python reschedule_progress.py --dry-run --max-interval 180
+    python reschedule_progress.py --reestimate-ease --workers 4
+"""
+import time
+import argparse
+from functools import partial
+
+import psycopg2
+
+from fix_verb_translations import load_env
+from instrumentation import span, add_instrumentation_arguments, configure_from_args, flush_metrics
+from sm2 import PROGRESS_COLUMNS, progress_arrays, reschedule, add_sm2_arguments, params_from_args
+from verb_db import (
+    VerbWriter, DryRunWriter, Checkpoint, process_verbs, process_verbs_parallel,
+    add_reader_arguments, add_writer_arguments
+)
+
+WRITE_COLUMNS = ['easeFactor', 'interval', 'nextReviewDate']
+
+# Filas por bloque: cuanto más grande, más se amortiza cada operación de NumPy
+DEFAULT_PROGRESS_ITERSIZE = 50000
+
+
+def build_progress_updates(rows, params, reestimate_ease=False):
+    """Recalcula un bloque de filas (id, col_1, ..., col_n) y devuelve solo las que cambian
+
+    Mismo contrato que build_verb_updates: (updates, not_found, skipped), con
+    updates en el formato de VerbWriter (easeFactor, interval, nextReviewDate, id).
+    """
+    arrays = progress_arrays(rows)
+    result = reschedule(arrays, params, reestimate_ease=reestimate_ease)
+    changed = result['changed']
+    updates = list(zip(
+        result['easeFactor'][changed].tolist(),
+        result['interval'][changed].tolist(),
+        result['nextReviewDate'][changed].tolist(),
+        arrays['id'][changed].tolist(),
+    ))
+    return updates, [], len(rows) - len(updates)
+
+
+def reschedule_progress(database_url, params, reestimate_ease=False, write_mode='copy', page_size=100,
+                        stream=True, itersize=DEFAULT_PROGRESS_ITERSIZE, chunk_size=None, resume=False,
+                        workers=1, dry_run=False):
+    """Replanifica toda la tabla y devuelve las estadísticas de process_verbs"""
+    build_updates = partial(build_progress_updates, params=params, reestimate_ease=reestimate_ease)
+    make_writer = partial(
+        VerbWriter, columns=WRITE_COLUMNS, mode=write_mode, page_size=page_size, table='UserProgress'
+    )
+    if dry_run:
+        make_writer = DryRunWriter
+
+    if workers > 1:
+        print(f"Conectando a la base de datos ({workers} conexiones en paralelo)...")
+        stats = process_verbs_parallel(
+            database_url, workers, make_writer, PROGRESS_COLUMNS, build_updates,
+            stream=stream, itersize=itersize, chunk_size=chunk_size, resume=resume, table='UserProgress'
+        )
+    else:
+        print(f"Conectando a la base de datos...")
+        conn = psycopg2.connect(database_url)
+        cursor = conn.cursor()
+        stats = process_verbs(
+            conn,
+            make_writer(cursor),
+            PROGRESS_COLUMNS,
+            build_updates,
+            stream=stream,
+            itersize=itersize,
+            chunk_size=chunk_size,
+            checkpoint=None if dry_run else Checkpoint('reschedule_progress'),
+            resume=resume,
+            table='UserProgress'
+        )
+        cursor.close()
+        conn.close()
+    return stats
+
+
+# Main
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Recalcula los calendarios SM-2 de UserProgress en bloque')
+    add_reader_arguments(parser)
+    add_writer_arguments(parser)
+    add_instrumentation_arguments(parser)
+    parser.set_defaults(itersize=DEFAULT_PROGRESS_ITERSIZE)
+    add_sm2_arguments(parser)
+    parser.add_argument('--reestimate-ease', action='store_true',
+                        help='Reconstruir easeFactor a partir de correctCount/incorrectCount')
+    args = parser.parse_args()
+    configure_from_args('reschedule_progress', args)
+
+    params = params_from_args(args)
+
+    print("=" * 60)
+    print("REPLANIFICACIÓN SM-2 DE USERPROGRESS")
+    print("=" * 60)
+    print(f"Parámetros: {params.as_dict()}")
+
+    with span('load_env'):
+        database_url = load_env().get('DATABASE_URL')
+    if not database_url:
+        print("❌ ERROR: No se encontró DATABASE_URL en .env")
+        exit(1)
+
+    start = time.perf_counter()
+    stats = reschedule_progress(
+        database_url, params, reestimate_ease=args.reestimate_ease, write_mode=args.writer,
+        page_size=args.page_size, stream=args.stream, itersize=args.itersize, chunk_size=args.chunk_size,
+        resume=args.resume, workers=args.workers, dry_run=args.dry_run
+    )
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print("RESUMEN")
+    print("=" * 60)
+    print(f"📊 Filas de progreso: {stats['total']} en {elapsed:.2f}s "
+          f"({stats['total'] / elapsed if elapsed else 0:,.0f} filas/s)")
+    if args.dry_run:
+        print(f"🧪 Modo en seco: {stats['updated']} filas cambiarían, {stats['skipped']} sin cambios")
+    else:
+        print(f"✅ Filas replanificadas: {stats['updated']}")
+        print(f"⏭️  Filas sin cambios: {stats['skipped']}")
+
+    flush_metrics()
+    print("\n✅ Proceso completado!")
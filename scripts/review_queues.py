@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Colas de repaso precalculadas por usuario ("ReviewQueue")
+
+Saber qué toca repasar exigía filtrar "UserProgress" por userId y
+nextReviewDate <= now() y unir "Word"/"Verb" en cada carga del dashboard. Este
+script mantiene una fila por usuario en "ReviewQueue" (prisma/schema.prisma):
+
+  items        jsonb con los próximos repasos ordenados por nextReviewDate, con
+               los campos que muestra el dashboard (type, title, subtitle, level,
+               pronunciation, masteryLevel...)
+  dueCount     repasos pendientes al refrescar la cola
+  nextDueAt    fecha del primer repaso de la cola
+  coversUntil  hasta cuándo es completa la cola: horizonte de --horizon-days o,
+               si se recortó a --max-items, la fecha del último elemento
+
+El dashboard lee la fila de su usuario y toma los elementos con
+nextReviewDate <= ahora: una lectura por clave en lugar de un join filtrado.
+
+El refresco es incremental: solo se recalculan los usuarios con filas de
+progreso cambiadas desde la marca de agua (o con cambios en las palabras y
+verbos que repasan), aquellos cuya cola ya no cubre el horizonte y aquellos con
+elementos en la cola cuyo progreso se ha borrado. Cada lote de usuarios se
+recalcula dentro de PostgreSQL con un único INSERT ... ON CONFLICT.
+La marca de agua se guarda en scripts/.cache/review_queues_state.json; sin ella
+(o con --full) se recalculan todos los usuarios.
+"""
+import os
+import json
+import time
+import argparse
+
+import psycopg2
+
+from instrumentation import span, add_instrumentation_arguments, configure_from_args, flush_metrics
+from verb_db import SCRIPTS_DIR, SYNC_OVERLAP
+
+STATE_PATH = os.path.join(SCRIPTS_DIR, '.cache', 'review_queues_state.json')
+
+DEFAULT_HORIZON_DAYS = 7
+DEFAULT_MAX_ITEMS = 200
+DEFAULT_BATCH_SIZE = 1000
+
+# Prisma guarda los DateTime en UTC en columnas timestamp sin zona
+DB_NOW = "(now() AT TIME ZONE 'UTC')"
+
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def ensure_review_queue_table(cursor):
+    """Crea "ReviewQueue" si aún no se ha aplicado el esquema de Prisma (mismo DDL que prisma db push)"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS "ReviewQueue" (
+            "userId" TEXT NOT NULL,
+            "items" JSONB NOT NULL DEFAULT '[]',
+            "dueCount" INTEGER NOT NULL DEFAULT 0,
+            "nextDueAt" TIMESTAMP(3),
+            "coversUntil" TIMESTAMP(3) NOT NULL,
+            "refreshedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT "ReviewQueue_pkey" PRIMARY KEY ("userId"),
+            CONSTRAINT "ReviewQueue_userId_fkey" FOREIGN KEY ("userId")
+                REFERENCES "User"("id") ON DELETE CASCADE ON UPDATE CASCADE
+        )
+    ''')
+
+
+def stale_users(cursor, high_water, horizon_days):
+    """Usuarios cuya cola hay que recalcular (todos los que tienen progreso o cola si no hay marca de agua)"""
+    if not high_water:
+        cursor.execute('SELECT "userId" FROM "UserProgress" UNION SELECT "userId" FROM "ReviewQueue"')
+        return [row[0] for row in cursor.fetchall()]
+
+    since = f"%(high_water)s::timestamp - %(overlap)s * interval '1 second'"
+    cursor.execute(f'''
+        SELECT "userId" FROM "UserProgress" WHERE "updatedAt" >= {since}
+        UNION
+        SELECT up."userId" FROM "UserProgress" AS up
+        JOIN "Word" AS w ON w.id = up."wordId"
+        WHERE w."updatedAt" >= {since}
+        UNION
+        SELECT up."userId" FROM "UserProgress" AS up
+        JOIN "Verb" AS v ON v.id = up."verbId"
+        WHERE v."updatedAt" >= {since}
+        UNION
+        SELECT "userId" FROM "ReviewQueue"
+        WHERE "coversUntil" <= {DB_NOW} + %(margin)s * interval '1 day'
+        UNION
+        -- Colas con elementos cuyo progreso ya no existe (reinicios, borrados en
+        -- cascada de "Word"/"Verb"): los borrados no dejan "updatedAt" que comparar
+        SELECT q."userId" FROM "ReviewQueue" AS q
+        CROSS JOIN LATERAL jsonb_array_elements(q."items") AS item
+        LEFT JOIN "UserProgress" AS up ON up.id = item->>'progressId'
+        WHERE up.id IS NULL
+    ''', {'high_water': high_water, 'overlap': SYNC_OVERLAP, 'margin': horizon_days / 2})
+    return [row[0] for row in cursor.fetchall()]
+
+
+def refresh_queues(cursor, user_ids, horizon_days=DEFAULT_HORIZON_DAYS, max_items=DEFAULT_MAX_ITEMS):
+    """Recalcula dentro de PostgreSQL la cola de cada usuario de user_ids; devuelve (usuarios, elementos)"""
+    cursor.execute(f'''
+        WITH items AS (
+            SELECT up."userId",
+                   up."nextReviewDate",
+                   row_number() OVER (
+                       PARTITION BY up."userId" ORDER BY up."nextReviewDate", up.id
+                   ) AS position,
+                   jsonb_build_object(
+                       'progressId', up.id,
+                       'type', CASE WHEN up."verbId" IS NOT NULL THEN 'verb' ELSE 'word' END,
+                       'itemId', COALESCE(up."verbId", up."wordId"),
+                       'title', COALESCE(v.infinitive, w.english),
+                       'subtitle', COALESCE(v."spanishTranslation", w.spanish),
+                       'level', COALESCE(v.level, w.level),
+                       'pronunciation', COALESCE(v."pronunciationIPA", w.pronunciation),
+                       'nextReviewDate', up."nextReviewDate",
+                       'masteryLevel', up."masteryLevel",
+                       'repetitions', up.repetitions
+                   ) AS item
+            FROM "UserProgress" AS up
+            LEFT JOIN "Verb" AS v ON v.id = up."verbId"
+            LEFT JOIN "Word" AS w ON w.id = up."wordId"
+            WHERE up."userId" = ANY(%(users)s)
+              AND up."nextReviewDate" < {DB_NOW} + %(horizon)s * interval '1 day'
+        ), queues AS (
+            SELECT "userId",
+                   jsonb_agg(item ORDER BY position) FILTER (WHERE position <= %(max_items)s) AS items,
+                   count(*) FILTER (WHERE "nextReviewDate" <= {DB_NOW}) AS due_count,
+                   min("nextReviewDate") AS next_due_at,
+                   max("nextReviewDate") FILTER (WHERE position <= %(max_items)s) AS last_included,
+                   count(*) AS total
+            FROM items
+            GROUP BY "userId"
+        ), refreshed AS (
+            INSERT INTO "ReviewQueue" ("userId", "items", "dueCount", "nextDueAt", "coversUntil", "refreshedAt")
+            SELECT u.id,
+                   COALESCE(q.items, '[]'::jsonb),
+                   COALESCE(q.due_count, 0),
+                   q.next_due_at,
+                   CASE WHEN q.total > %(max_items)s THEN q.last_included
+                        ELSE {DB_NOW} + %(horizon)s * interval '1 day' END,
+                   {DB_NOW}
+            FROM unnest(%(users)s::text[]) AS u(id)
+            LEFT JOIN queues AS q ON q."userId" = u.id
+            ON CONFLICT ("userId") DO UPDATE SET
+                "items" = EXCLUDED."items",
+                "dueCount" = EXCLUDED."dueCount",
+                "nextDueAt" = EXCLUDED."nextDueAt",
+                "coversUntil" = EXCLUDED."coversUntil",
+                "refreshedAt" = EXCLUDED."refreshedAt"
+            RETURNING jsonb_array_length("items") AS items
+        )
+        SELECT count(*), COALESCE(sum(items), 0) FROM refreshed
+    ''', {'users': list(user_ids), 'horizon': horizon_days, 'max_items': max_items})
+    return cursor.fetchone()
+
+
+def build_review_queues(database_url, full=False, horizon_days=DEFAULT_HORIZON_DAYS, max_items=DEFAULT_MAX_ITEMS,
+                        batch_size=DEFAULT_BATCH_SIZE, state_path=STATE_PATH):
+    """Refresca las colas desactualizadas por lotes de usuarios y guarda la nueva marca de agua"""
+    state = {} if full else load_state(state_path)
+    conn = psycopg2.connect(database_url)
+    cursor = conn.cursor()
+    try:
+        ensure_review_queue_table(cursor)
+        # La nueva marca de agua se toma antes de leer: lo que cambie durante la
+        # ejecución entra en la siguiente
+        cursor.execute(f'SELECT {DB_NOW}')
+        high_water = cursor.fetchone()[0].isoformat()
+
+        with span('stale_users') as users_span:
+            users = stale_users(cursor, state.get('high_water'), horizon_days)
+            users_span.rows_out = len(users)
+        conn.commit()
+        print(f"👥 {len(users)} usuarios con la cola desactualizada "
+              f"({'recálculo completo' if not state.get('high_water') else 'incremental'})")
+
+        total_users = total_items = 0
+        for start in range(0, len(users), batch_size):
+            batch = users[start:start + batch_size]
+            with span('refresh_queues', rows_in=len(batch)) as refresh_span:
+                refreshed, items = refresh_queues(cursor, batch, horizon_days=horizon_days, max_items=max_items)
+                conn.commit()
+                refresh_span.rows_out = items
+            total_users += refreshed
+            total_items += items
+
+        save_state({'high_water': high_water}, state_path)
+        return {'users': total_users, 'items': total_items}
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# Main
+if __name__ == '__main__':
+    from fix_verb_translations import load_env
+
+    parser = argparse.ArgumentParser(description='Refresca las colas de repaso precalculadas por usuario')
+    add_instrumentation_arguments(parser)
+    parser.add_argument(
+        '--full', action='store_true',
+        help='Recalcular las colas de todos los usuarios'
+    )
+    parser.add_argument(
+        '--horizon-days', type=float, default=DEFAULT_HORIZON_DAYS,
+        help='Días hacia delante que cubre cada cola'
+    )
+    parser.add_argument(
+        '--max-items', type=int, default=DEFAULT_MAX_ITEMS,
+        help='Elementos máximos por cola'
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+        help='Usuarios por sentencia (y por commit)'
+    )
+    args = parser.parse_args()
+    configure_from_args('review_queues', args)
+
+    print("=" * 60)
+    print("COLAS DE REPASO POR USUARIO")
+    print("=" * 60)
+
+    database_url = load_env().get('DATABASE_URL')
+    if not database_url:
+        print("❌ ERROR: No se encontró DATABASE_URL en .env")
+        exit(1)
+
+    start = time.perf_counter()
+    stats = build_review_queues(
+        database_url, full=args.full, horizon_days=args.horizon_days, max_items=args.max_items,
+        batch_size=args.batch_size
+    )
+    print(f"✅ {stats['users']} colas refrescadas con {stats['items']} elementos "
+          f"en {time.perf_counter() - start:.2f}s")
+
+    flush_metrics()
+    print("\n✅ Proceso completado!")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Índices de trigramas (pg_trgm) para la búsqueda de palabras y verbos
+
+app/api/search/route.ts y app/api/verbs/route.ts buscan con
+`contains ... mode: 'insensitive'`, que Prisma traduce a ILIKE '%texto%'. Un
+B-tree no sirve para ese patrón, así que cada pulsación del typeahead recorre la
+tabla entera. Un índice GIN con gin_trgm_ops sí resuelve ILIKE '%texto%' (con al
+menos 3 caracteres).
+
+Este script:
+  1. ejecuta EXPLAIN (ANALYZE, BUFFERS) y mide la latencia de consultas
+     representativas (las mismas que generan las rutas, con términos sacados de
+     la propia tabla)
+  2. crea la extensión pg_trgm y los índices con CREATE INDEX CONCURRENTLY
+     (sin bloquear escrituras) y actualiza las estadísticas con ANALYZE
+  3. repite las mediciones e imprime plan, buffers y latencia antes/después
+
+Los índices también están declarados en prisma/schema.prisma con los mismos
+nombres, para que `prisma db push` no los elimine.
+
+Uso:
+    python search_indexes.py                  # medir, crear índices, medir
+    python search_indexes.py --explain-only   # solo medir
+    python search_indexes.py --drop           # eliminar los índices
+"""
+import json
+import time
+import random
+import argparse
+import statistics
+
+import psycopg2
+
+from fix_verb_translations import load_env
+from verb_db import quote_ident
+
+# (tabla, columna) buscadas con ILIKE por las rutas de la app
+SEARCH_COLUMNS = [
+    ('Word', 'english'),
+    ('Word', 'spanish'),
+    ('Verb', 'infinitive'),
+    ('Verb', 'spanishTranslation'),
+]
+
+# Consultas equivalentes a las de Prisma: (nombre, tabla, columnas buscadas, SQL)
+SEARCH_QUERIES = [
+    ('search_words', 'Word', ('english', 'spanish'),
+     'SELECT * FROM "Word" WHERE "english" ILIKE %s OR "spanish" ILIKE %s ORDER BY "english" LIMIT 10'),
+    ('search_verbs', 'Verb', ('infinitive', 'spanishTranslation'),
+     'SELECT * FROM "Verb" WHERE "infinitive" ILIKE %s OR "spanishTranslation" ILIKE %s '
+     'ORDER BY "infinitive" LIMIT 10'),
+    ('verbs_count', 'Verb', ('infinitive', 'spanishTranslation'),
+     'SELECT count(*) FROM "Verb" WHERE "infinitive" ILIKE %s OR "spanishTranslation" ILIKE %s'),
+]
+
+DEFAULT_SAMPLES = 3
+DEFAULT_REPEAT = 5
+
+
+def index_name(table, column):
+    """Nombre estable del índice (el mismo que en schema.prisma)"""
+    return f'{table.lower()}_{column.lower()}_trgm_idx'
+
+
+def like_pattern(term):
+    """Patrón de `contains`: el término escapado entre comodines, como hace Prisma"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def sample_terms(conn, samples=DEFAULT_SAMPLES, seed=0):
+    """Términos de búsqueda realistas por tabla: fragmentos de 3 a 5 letras de valores existentes"""
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+    terms = {}
+    for table in sorted({table for table, _ in SEARCH_COLUMNS}):
+        columns = [column for t, column in SEARCH_COLUMNS if t == table]
+        col_list = ', '.join(quote_ident(column) for column in columns)
+        cursor.execute(
+            f'SELECT {col_list} FROM {quote_ident(table)} ORDER BY md5(id) LIMIT %s', (samples * 10,)
+        )
+        values = [value for row in cursor.fetchall() for value in row if value and len(value) >= 3]
+        picked = []
+        for value in rng.sample(values, min(samples, len(values))):
+            length = rng.randint(3, min(5, len(value)))
+            start = rng.randint(0, len(value) - length)
+            picked.append(value[start:start + length].lower())
+        terms[table] = picked
+    cursor.close()
+    return terms
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _plan_nodes(child)
+
+
+def explain(cursor, sql, params):
+    """EXPLAIN (ANALYZE, BUFFERS) en JSON, resumido: tiempos, buffers y nodos de acceso"""
+    cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}', params)
+    result = cursor.fetchone()[0]
+    result = result[0] if isinstance(result, list) else json.loads(result)[0]
+    plan = result['Plan']
+    scans = []
+    for node in _plan_nodes(plan):
+        if 'Scan' in node['Node Type']:
+            scans.append(node['Node Type'] + (f" ({node['Index Name']})" if 'Index Name' in node else ''))
+    return {
+        'execution_ms': result['Execution Time'],
+        'planning_ms': result['Planning Time'],
+        'shared_hit': plan.get('Shared Hit Blocks', 0),
+        'shared_read': plan.get('Shared Read Blocks', 0),
+        'scans': scans,
+    }
+
+
+def measure(conn, terms, repeat=DEFAULT_REPEAT):
+    """Plan y latencia (mediana vista desde el cliente) de cada consulta con cada término"""
+    cursor = conn.cursor()
+    results = {}
+    for name, table, columns, sql in SEARCH_QUERIES:
+        for term in terms[table]:
+            params = [like_pattern(term)] * len(columns)
+            report = explain(cursor, sql, params)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                cursor.execute(sql, params)
+                cursor.fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            report['client_ms'] = statistics.median(timings)
+            results[(name, term)] = report
+    conn.rollback()
+    cursor.close()
+    return results
+
+
+def create_indexes(conn):
+    """Crea pg_trgm y los índices GIN sin bloquear escrituras; devuelve los que se han creado"""
+    conn.autocommit = True
+    cursor = conn.cursor()
+    cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    created = []
+    for table, column in SEARCH_COLUMNS:
+        name = index_name(table, column)
+        # Un CREATE INDEX CONCURRENTLY interrumpido deja el índice inválido: se rehace
+        cursor.execute('''
+            SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = %s
+        ''', (name,))
+        row = cursor.fetchone()
+        if row and row[0]:
+            print(f"   ⏭️  {name} ya existe")
+            continue
+        if row:
+            cursor.execute(f'DROP INDEX CONCURRENTLY {quote_ident(name)}')
+        start = time.perf_counter()
+        cursor.execute(
+            f'CREATE INDEX CONCURRENTLY {quote_ident(name)} '
+            f'ON {quote_ident(table)} USING gin ({quote_ident(column)} gin_trgm_ops)'
+        )
+        print(f"   ✅ {name} creado en {time.perf_counter() - start:.2f}s")
+        created.append(name)
+    for table in sorted({table for table, _ in SEARCH_COLUMNS}):
+        cursor.execute(f'ANALYZE {quote_ident(table)}')
+    cursor.close()
+    conn.autocommit = False
+    return created
+
+
+def drop_indexes(conn):
+    conn.autocommit = True
+    cursor = conn.cursor()
+    for table, column in SEARCH_COLUMNS:
+        cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {quote_ident(index_name(table, column))}')
+        print(f"   🗑️  {index_name(table, column)}")
+    cursor.close()
+    conn.autocommit = False
+
+
+def print_measurements(before, after=None):
+    for (name, term), old in before.items():
+        print(f"\n🔍 {name} '{term}'")
+        print(f"   antes:   {old['execution_ms']:8.2f} ms servidor {old['client_ms']:8.2f} ms cliente "
+              f"{old['shared_hit'] + old['shared_read']:>7} buffers  {', '.join(old['scans'])}")
+        if after is None:
+            continue
+        new = after[(name, term)]
+        delta = (new['client_ms'] - old['client_ms']) / old['client_ms'] * 100 if old['client_ms'] else 0
+        print(f"   después: {new['execution_ms']:8.2f} ms servidor {new['client_ms']:8.2f} ms cliente "
+              f"{new['shared_hit'] + new['shared_read']:>7} buffers  {', '.join(new['scans'])}")
+        print(f"   Δ latencia: {delta:+.1f}%")
+
+
+def print_summary(before, after):
+    old = statistics.median(report['execution_ms'] for report in before.values())
+    new = statistics.median(report['execution_ms'] for report in after.values())
+    using_index = sum(any('trgm_idx' in scan for scan in report['scans']) for report in after.values())
+    print(f"\n📊 Mediana en servidor: {old:.2f} ms -> {new:.2f} ms "
+          f"({using_index}/{len(after)} consultas usan un índice de trigramas)")
+
+
+# Main
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Crea índices pg_trgm para la búsqueda y mide su efecto')
+    parser.add_argument(
+        '--explain-only', action='store_true',
+        help='Solo medir las consultas, sin crear índices'
+    )
+    parser.add_argument(
+        '--drop', action='store_true',
+        help='Eliminar los índices de trigramas'
+    )
+    parser.add_argument(
+        '--term', action='append', default=None,
+        help='Término de búsqueda a medir (se puede repetir); por defecto se sacan de las tablas'
+    )
+    parser.add_argument(
+        '--samples', type=int, default=DEFAULT_SAMPLES,
+        help='Términos de muestra por tabla cuando no se indica --term'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=DEFAULT_REPEAT,
+        help='Ejecuciones por consulta para la mediana de latencia'
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("ÍNDICES DE TRIGRAMAS PARA LA BÚSQUEDA")
+    print("=" * 70)
+
+    database_url = load_env().get('DATABASE_URL')
+    if not database_url:
+        print("❌ ERROR: No se encontró DATABASE_URL en .env")
+        exit(1)
+
+    conn = psycopg2.connect(database_url)
+
+    if args.drop:
+        print("\n🗑️  Eliminando índices...")
+        drop_indexes(conn)
+        conn.close()
+        exit(0)
+
+    if args.term:
+        terms = {table: args.term for table, _ in SEARCH_COLUMNS}
+    else:
+        terms = sample_terms(conn, samples=args.samples)
+        conn.rollback()
+    short = sorted({term for table_terms in terms.values() for term in table_terms if len(term) < 3})
+    if short:
+        print(f"⚠️  Los términos de menos de 3 letras no pueden usar el índice: {short}")
+
+    print(f"\n⏱️  Midiendo consultas ({args.repeat} ejecuciones por consulta)...")
+    before = measure(conn, terms, repeat=args.repeat)
+
+    if args.explain_only:
+        print_measurements(before)
+    else:
+        print(f"\n🔨 Creando índices...")
+        create_indexes(conn)
+        print(f"\n⏱️  Repitiendo las mediciones...")
+        after = measure(conn, terms, repeat=args.repeat)
+        print_measurements(before, after)
+        print_summary(before, after)
+
+    conn.close()
+    print("\n✅ Proceso completado!")
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Claves de búsqueda sin tildes para "Word" y "Verb"
+
+Quien aprende español escribe "sonar" por "soñar" o "despues" por "después". En
+lugar de plegar los acentos en cada consulta (unaccent(...) no usa índices), las
+claves se calculan aquí y se guardan en la tabla "SearchKey" (prisma/schema.prisma),
+con un índice de trigramas sobre "key":
+
+  entity    'Word' o 'Verb'
+  entityId  id de la fila de origen
+  field     columna de origen (english, spanish, infinitive, spanishTranslation)
+  key       texto plegado: sin diacríticos, en minúsculas y sin puntuación
+
+Cada valor genera su clave completa y una por alternativa ("ser/estar" ->
+"ser/estar", "ser", "estar"). La app pliega el texto buscado del mismo modo
+(foldSearchText en lib/search.ts) y app/api/search y app/api/verbs añaden a sus
+resultados los ids de "SearchKey" cuya clave contiene el texto plegado.
+
+La sincronización es incremental: solo se procesan las filas con "updatedAt"
+posterior a la marca de agua de la última ejecución (guardada en
+scripts/.cache/search_keys_state.json). Las claves que ya no corresponden a la
+fila se borran, las nuevas se insertan en bloque (COPY binario + INSERT ... ON
+CONFLICT) y también se eliminan las de filas que ya no existen. Los scripts de
+corrección la ejecutan al terminar.
+
+Uso:
+    python search_keys.py            # incremental (completa la primera vez)
+    python search_keys.py --full     # recalcular todas las claves
+"""
+import os
+import re
+import json
+import time
+import argparse
+import unicodedata
+
+import psycopg2
+
+from instrumentation import span
+from verb_db import rows_to_binary_copy_buffer, quote_ident, SCRIPTS_DIR, DEFAULT_ITERSIZE, SYNC_OVERLAP
+
+# Columnas con claves de búsqueda por tabla
+SEARCH_KEY_FIELDS = {
+    'Word': ['english', 'spanish'],
+    'Verb': ['infinitive', 'spanishTranslation'],
+}
+SEARCH_KEY_TABLE = 'SearchKey'
+STATE_PATH = os.path.join(SCRIPTS_DIR, '.cache', 'search_keys_state.json')
+
+# Separadores de alternativas dentro de un valor ("ser/estar", "hablar, decir")
+_ALTERNATIVES = re.compile(r'\s*[/,;]\s*')
+_PUNCTUATION = re.compile(r"[^\w\s/,;'-]")
+_SPACES = re.compile(r'\s+')
+
+
+def fold(text):
+    """Texto sin diacríticos, en minúsculas (casefold) y con los espacios normalizados
+
+    La ñ también se pliega (ñ -> n), que es justo lo que se busca con "sonar".
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _SPACES.sub(' ', stripped.casefold()).strip()
+
+
+def search_keys(value):
+    """Claves de un valor: el valor plegado completo y cada alternativa, sin duplicados"""
+    if not value:
+        return []
+    folded = _SPACES.sub(' ', _PUNCTUATION.sub(' ', fold(value))).strip()
+    keys = [folded] if folded else []
+    for part in _ALTERNATIVES.split(folded):
+        part = part.strip(" '-")
+        if part and part not in keys:
+            keys.append(part)
+    return keys
+
+
+def key_rows(table, rows, fields):
+    """Filas (entity, entityId, field, key) para filas (id, valor_1, ..., valor_n)"""
+    for row in rows:
+        entity_id = row[0]
+        for field, value in zip(fields, row[1:]):
+            for key in search_keys(value):
+                yield (table, entity_id, field, key)
+
+
+# Estado local (marca de agua por tabla)
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def ensure_trgm_extension(cursor):
+    """Crea pg_trgm si no existe; devuelve False si no está disponible o no hay permisos"""
+    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    if cursor.fetchone():
+        return True
+    cursor.execute('SAVEPOINT create_pg_trgm')
+    try:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except psycopg2.Error as e:
+        cursor.execute('ROLLBACK TO SAVEPOINT create_pg_trgm')
+        print(f"⚠️  No se pudo crear pg_trgm ({(e.pgerror or str(e)).strip()}); "
+              f"{SEARCH_KEY_TABLE} se mantiene sin índice de trigramas")
+        return False
+    cursor.execute('RELEASE SAVEPOINT create_pg_trgm')
+    return True
+
+
+def ensure_search_key_table(cursor):
+    """Crea "SearchKey" si aún no se ha aplicado el esquema de Prisma (mismo DDL que prisma db push)"""
+    trgm = ensure_trgm_extension(cursor)
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {quote_ident(SEARCH_KEY_TABLE)} (
+            "entity" TEXT NOT NULL,
+            "entityId" TEXT NOT NULL,
+            "field" TEXT NOT NULL,
+            "key" TEXT NOT NULL,
+            CONSTRAINT "SearchKey_pkey" PRIMARY KEY ("entity", "entityId", "field", "key")
+        )
+    ''')
+    if not trgm:
+        return
+    cursor.execute(f'''
+        CREATE INDEX IF NOT EXISTS searchkey_key_trgm_idx
+        ON {quote_ident(SEARCH_KEY_TABLE)} USING gin ("key" gin_trgm_ops)
+    ''')
+
+
+def sync_table(conn, table, high_water=None, itersize=DEFAULT_ITERSIZE):
+    """Recalcula las claves de las filas cambiadas desde high_water (None = todas)
+
+    Devuelve (estadísticas, nueva marca de agua).
+    """
+    fields = SEARCH_KEY_FIELDS[table]
+    cursor = conn.cursor()
+    target = quote_ident(SEARCH_KEY_TABLE)
+
+    # Filas cambiadas: se leen en streaming y sus claves van a una tabla temporal
+    cursor.execute('''
+        CREATE TEMP TABLE searchkey_staging (
+            "entity" text, "entityId" text, "field" text, "key" text
+        ) ON COMMIT DROP
+    ''')
+    cursor.execute('CREATE TEMP TABLE searchkey_ids (id text PRIMARY KEY) ON COMMIT DROP')
+
+    col_list = ', '.join(['id'] + [quote_ident(field) for field in fields] + ['"updatedAt"'])
+    query = f'SELECT {col_list} FROM {quote_ident(table)}'
+    params = []
+    if high_water:
+        query += ' WHERE "updatedAt" >= %s::timestamp - %s * interval \'1 second\''
+        params = [high_water, SYNC_OVERLAP]
+
+    reader = conn.cursor(name=f'{table.lower()}_search_keys')
+    reader.itersize = itersize
+    reader.execute(query, params)
+    processed = 0
+    keys = 0
+    with span('search_keys_compute') as compute_span:
+        while True:
+            rows = reader.fetchmany(itersize)
+            if not rows:
+                break
+            batch = list(key_rows(table, (row[:-1] for row in rows), fields))
+            cursor.copy_expert(
+                'COPY searchkey_staging FROM STDIN WITH (FORMAT binary)',
+                rows_to_binary_copy_buffer(batch, ['text'] * 4)
+            )
+            cursor.copy_expert(
+                'COPY searchkey_ids FROM STDIN WITH (FORMAT binary)',
+                rows_to_binary_copy_buffer(((row[0],) for row in rows), ['text'])
+            )
+            processed += len(rows)
+            keys += len(batch)
+            high_water = max(high_water or '', max(row[-1] for row in rows).isoformat())
+        compute_span.rows_in = processed
+        compute_span.rows_out = keys
+    reader.close()
+
+    with span('search_keys_write') as write_span:
+        # Claves de las filas procesadas que ya no corresponden a su valor actual
+        cursor.execute(f'''
+            DELETE FROM {target} AS s
+            USING searchkey_ids AS i
+            WHERE s."entity" = %s AND s."entityId" = i.id
+              AND NOT EXISTS (
+                  SELECT 1 FROM searchkey_staging AS k
+                  WHERE (k."entity", k."entityId", k."field", k."key")
+                      = (s."entity", s."entityId", s."field", s."key")
+              )
+        ''', (table,))
+        stale = cursor.rowcount
+
+        cursor.execute(f'''
+            INSERT INTO {target} ("entity", "entityId", "field", "key")
+            SELECT DISTINCT "entity", "entityId", "field", "key" FROM searchkey_staging
+            ON CONFLICT DO NOTHING
+        ''')
+        inserted = cursor.rowcount
+
+        # Filas borradas de la tabla de origen
+        cursor.execute(f'''
+            DELETE FROM {target} AS s
+            WHERE s."entity" = %s
+              AND NOT EXISTS (SELECT 1 FROM {quote_ident(table)} AS t WHERE t.id = s."entityId")
+        ''', (table,))
+        orphaned = cursor.rowcount
+        write_span.rows_out = inserted + stale + orphaned
+
+    conn.commit()
+    cursor.close()
+    return {
+        'table': table,
+        'full': not params,
+        'rows': processed,
+        'keys': keys,
+        'inserted': inserted,
+        'deleted': stale + orphaned,
+    }, high_water
+
+
+def sync_search_keys(database_url, tables=tuple(SEARCH_KEY_FIELDS), full=False, state_path=STATE_PATH):
+    """Pone al día las claves de búsqueda de `tables` y guarda la nueva marca de agua"""
+    state = {} if full else load_state(state_path)
+    conn = psycopg2.connect(database_url)
+    try:
+        cursor = conn.cursor()
+        ensure_search_key_table(cursor)
+        conn.commit()
+        cursor.close()
+
+        results = []
+        for table in tables:
+            start = time.perf_counter()
+            stats, state[table] = sync_table(conn, table, high_water=state.get(table))
+            save_state(state, state_path)
+            kind = 'completa' if stats['full'] else 'incremental'
+            print(f"🔤 Claves de búsqueda {table} ({kind}): {stats['rows']} filas, {stats['keys']} claves, "
+                  f"{stats['inserted']} insertadas, {stats['deleted']} borradas "
+                  f"en {time.perf_counter() - start:.2f}s")
+            results.append(stats)
+        return results
+    finally:
+        conn.close()
+
+
+def sync_search_keys_after_run(database_url, tables=tuple(SEARCH_KEY_FIELDS)):
+    """sync_search_keys para el final de los scripts de corrección
+
+    Sus escrituras ya están confirmadas: un fallo aquí se informa en lugar de
+    terminar la ejecución con un traceback, y basta con lanzar después
+    python search_keys.py.
+    """
+    try:
+        return sync_search_keys(database_url, tables=tables)
+    except (psycopg2.Error, OSError) as e:
+        print(f"⚠️  No se pudieron actualizar las claves de búsqueda: {e}")
+        print("   Los cambios ya están guardados; ejecuta python search_keys.py para sincronizarlas")
+        return None
+
+
+# Main
+if __name__ == '__main__':
+    from fix_verb_translations import load_env
+
+    parser = argparse.ArgumentParser(description='Calcula las claves de búsqueda sin tildes de "Word" y "Verb"')
+    parser.add_argument(
+        '--full', action='store_true',
+        help='Recalcular las claves de todas las filas, no solo las cambiadas'
+    )
+    parser.add_argument(
+        '--tables', nargs='+', default=list(SEARCH_KEY_FIELDS), choices=list(SEARCH_KEY_FIELDS),
+        help='Tablas a procesar'
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CLAVES DE BÚSQUEDA SIN TILDES")
+    print("=" * 60)
+
+    database_url = load_env().get('DATABASE_URL')
+    if not database_url:
+        print("❌ ERROR: No se encontró DATABASE_URL en .env")
+        exit(1)
+
+    sync_search_keys(database_url, tables=args.tables, full=args.full)
+    print("\n✅ Proceso completado!")
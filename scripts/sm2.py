@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Algoritmo SM-2 vectorizado con NumPy sobre el estado de "UserProgress"
+
+Todas las funciones trabajan sobre arrays (una posición por fila de progreso),
+así que un bloque de decenas de miles de filas se recalcula con unas pocas
+operaciones de NumPy en lugar de un bucle por fila.
+
+Reglas (SM-2 clásico, con los parámetros de SM2Params):
+  - respuesta con calidad >= 3: repetitions + 1; el intervalo pasa a
+    first_interval, second_interval o ceil(interval * easeFactor * interval_modifier)
+  - calidad < 3: repetitions vuelve a 0 y el intervalo a first_interval
+  - easeFactor += 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02), sin bajar de min_ease
+  - el intervalo nunca supera max_interval días
+
+Requiere numpy (pip install -r scripts/requirements.txt).
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Columnas de "UserProgress" que usa el planificador (además de id)
+PROGRESS_COLUMNS = [
+    'userId', 'easeFactor', 'repetitions', 'interval', 'nextReviewDate', 'lastReviewDate',
+    'correctCount', 'incorrectCount', 'totalReviews',
+]
+_FLOAT_COLUMNS = {'easeFactor'}
+_INT_COLUMNS = {'repetitions', 'interval', 'correctCount', 'incorrectCount', 'totalReviews'}
+_DATE_COLUMNS = {'nextReviewDate', 'lastReviewDate'}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NAT = np.iinfo(np.int64).min
+
+
+def datetime_array(values):
+    """datetime (sin zona, como los DateTime de Prisma) -> datetime64[us]; None -> NaT
+
+    np.array(valores, dtype='datetime64') convierte objeto a objeto y es varias
+    veces más lento que calcular los microsegundos desde la época.
+    """
+    micros = ((value - _EPOCH) // _MICROSECOND if value is not None else _NAT for value in values)
+    return np.fromiter(micros, dtype=np.int64, count=len(values)).view('datetime64[us]')
+
+
+class SM2Params:
+    """Parámetros del planificador (los valores por defecto son los de SM-2 y del esquema de Prisma)
+
+    quality_correct / quality_incorrect son la calidad (0-5) que se asume para una
+    respuesta correcta o incorrecta cuando solo se conocen los contadores.
+    """
+
+    def __init__(self, first_interval=1, second_interval=6, initial_ease=2.5, min_ease=1.3, max_ease=None,
+                 interval_modifier=1.0, max_interval=365, quality_correct=4, quality_incorrect=2):
+        self.first_interval = first_interval
+        self.second_interval = second_interval
+        self.initial_ease = initial_ease
+        self.min_ease = min_ease
+        self.max_ease = max_ease
+        self.interval_modifier = interval_modifier
+        self.max_interval = max_interval
+        self.quality_correct = quality_correct
+        self.quality_incorrect = quality_incorrect
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def progress_arrays(rows, columns=PROGRESS_COLUMNS):
+    """Convierte filas (id, col_1, ..., col_n) en un dict de arrays por columna
+
+    Las fechas pasan a datetime64[us] (NULL -> NaT), los números a float64/int64.
+    """
+    values = list(zip(*rows)) if rows else [()] * (len(columns) + 1)
+    arrays = {'id': np.array(values[0], dtype=object)}
+    for column, column_values in zip(columns, values[1:]):
+        if column in _FLOAT_COLUMNS:
+            arrays[column] = np.array(column_values, dtype=np.float64)
+        elif column in _INT_COLUMNS:
+            arrays[column] = np.array(column_values, dtype=np.int64)
+        elif column in _DATE_COLUMNS:
+            arrays[column] = datetime_array(column_values)
+        else:
+            arrays[column] = np.array(column_values, dtype=object)
+    return arrays
+
+
+def ease_delta(quality):
+    """Variación del easeFactor para una calidad (escalar o array)"""
+    miss = 5 - np.asarray(quality, dtype=np.float64)
+    return 0.1 - miss * (0.08 + miss * 0.02)
+
+
+def clip_ease(ease, params):
+    return np.clip(ease, params.min_ease, params.max_ease if params.max_ease else np.inf)
+
+
+def review(ease, repetitions, interval, quality, params):
+    """Aplica una respuesta (calidad 0-5) a cada fila; devuelve (ease, repetitions, interval) nuevos"""
+    quality = np.asarray(quality)
+    passed = quality >= 3
+
+    grown = np.ceil(interval * ease * params.interval_modifier)
+    next_interval = np.where(
+        repetitions == 0, params.first_interval,
+        np.where(repetitions == 1, params.second_interval, grown)
+    )
+    new_interval = np.where(passed, next_interval, params.first_interval)
+    new_interval = np.minimum(new_interval, params.max_interval).astype(np.int64)
+    new_repetitions = np.where(passed, repetitions + 1, 0)
+    new_ease = clip_ease(ease + ease_delta(quality), params)
+    return new_ease, new_repetitions, new_interval
+
+
+def scheduled_interval(repetitions, ease, params):
+    """Intervalo tras `repetitions` aciertos seguidos con un easeFactor constante
+
+    Equivale a aplicar review() repetitions veces con calidad >= 3, pero
+    recorriendo solo hasta el máximo de repetitions del bloque.
+    """
+    interval = np.full(repetitions.shape, params.first_interval, dtype=np.float64)
+    interval[repetitions >= 2] = params.second_interval
+    for step in range(3, int(repetitions.max(initial=0)) + 1):
+        growing = repetitions >= step
+        interval[growing] = np.minimum(
+            np.ceil(interval[growing] * ease[growing] * params.interval_modifier), params.max_interval
+        )
+    return np.minimum(interval, params.max_interval).astype(np.int64)
+
+
+def estimate_ease(correct, incorrect, params):
+    """easeFactor reconstruido a partir de los contadores de aciertos y fallos
+
+    Sin el historial de respuestas el orden es desconocido: se suma la variación
+    de cada acierto y cada fallo al easeFactor inicial y se acota el resultado.
+    """
+    ease = (params.initial_ease
+            + correct * ease_delta(params.quality_correct)
+            + incorrect * ease_delta(params.quality_incorrect))
+    return clip_ease(ease, params)
+
+
+def reschedule(arrays, params, reestimate_ease=False):
+    """Recalcula easeFactor, interval y nextReviewDate de un bloque con los parámetros dados
+
+    El nuevo nextReviewDate es lastReviewDate + interval; las filas nunca
+    repasadas (sin lastReviewDate) conservan su fecha. Devuelve un dict con los
+    arrays nuevos y la máscara `changed` de filas que difieren de las guardadas.
+    """
+    if reestimate_ease:
+        ease = np.where(
+            arrays['totalReviews'] > 0,
+            estimate_ease(arrays['correctCount'], arrays['incorrectCount'], params),
+            params.initial_ease
+        )
+    else:
+        ease = clip_ease(arrays['easeFactor'], params)
+    ease = np.round(ease, 4)
+
+    interval = scheduled_interval(arrays['repetitions'], ease, params)
+    last_review = arrays['lastReviewDate']
+    reviewed = ~np.isnat(last_review)
+    next_review = np.where(
+        reviewed, last_review + interval.astype('timedelta64[D]'), arrays['nextReviewDate']
+    ).astype('datetime64[us]')
+
+    changed = (
+        ~np.isclose(ease, arrays['easeFactor'])
+        | (interval != arrays['interval'])
+        | (next_review != arrays['nextReviewDate'])
+    )
+    return {'easeFactor': ease, 'interval': interval, 'nextReviewDate': next_review, 'changed': changed}
+
+
+def add_sm2_arguments(parser):
+    """Añade los parámetros de SM-2 a un ArgumentParser"""
+    defaults = SM2Params()
+    parser.add_argument('--first-interval', type=int, default=defaults.first_interval,
+                        help='Días tras el primer acierto (y tras un fallo)')
+    parser.add_argument('--second-interval', type=int, default=defaults.second_interval,
+                        help='Días tras el segundo acierto seguido')
+    parser.add_argument('--initial-ease', type=float, default=defaults.initial_ease,
+                        help='easeFactor de partida (el valor por defecto del esquema)')
+    parser.add_argument('--min-ease', type=float, default=defaults.min_ease,
+                        help='easeFactor mínimo')
+    parser.add_argument('--max-ease', type=float, default=defaults.max_ease,
+                        help='easeFactor máximo (sin límite por defecto)')
+    parser.add_argument('--interval-modifier', type=float, default=defaults.interval_modifier,
+                        help='Multiplicador de los intervalos a partir del tercero')
+    parser.add_argument('--max-interval', type=int, default=defaults.max_interval,
+                        help='Intervalo máximo en días')
+    parser.add_argument('--quality-correct', type=int, default=defaults.quality_correct,
+                        help='Calidad SM-2 (0-5) que se asume para un acierto')
+    parser.add_argument('--quality-incorrect', type=int, default=defaults.quality_incorrect,
+                        help='Calidad SM-2 (0-5) que se asume para un fallo')
+    return parser
+
+
+def params_from_args(args):
+    """SM2Params con los valores de add_sm2_arguments"""
+    return SM2Params(
+        first_interval=args.first_interval,
+        second_interval=args.second_interval,
+        initial_ease=args.initial_ease,
+        min_ease=args.min_ease,
+        max_ease=args.max_ease,
+        interval_modifier=args.interval_modifier,
+        max_interval=args.max_interval,
+        quality_correct=args.quality_correct,
+        quality_incorrect=args.quality_incorrect,
+    )
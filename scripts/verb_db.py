@@ -0,0 +1,685 @@
+#!/usr/bin/env python3
+"""
+Utilidades compartidas para leer y escribir correcciones en la tabla "Verb" de Neon PostgreSQL
+"""
+import io
+import os
+import json
+import time
+import struct
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import execute_batch
+from psycopg2.pool import ThreadedConnectionPool
+
+from instrumentation import span
+
+# Modos de escritura disponibles
+#   copy:  COPY FROM STDIN a una tabla temporal + un único UPDATE ... FROM
+#   batch: execute_batch con un UPDATE por fila (comportamiento original)
+WRITE_MODES = ('copy', 'batch')
+DEFAULT_WRITE_MODE = 'copy'
+
+
+# Filas por FETCH del cursor con nombre (server-side)
+DEFAULT_ITERSIZE = 2000
+
+# Verbos por commit en el modo por bloques (--chunk-size / --resume)
+DEFAULT_CHUNK_SIZE = 500
+
+# Tamaño de lote adaptativo (--page-size auto)
+DEFAULT_TARGET_LATENCY = 0.25  # segundos por lote
+ADAPTIVE_MIN_SIZE = 10
+ADAPTIVE_MAX_SIZE = 10000
+ADAPTIVE_MAX_BYTES = 4 * 1024 * 1024  # datos por lote: acota memoria y tamaño de sentencia
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Prisma rellena "updatedAt" desde el cliente: las escrituras de los scripts lo marcan
+# a mano para que la réplica local (verb_mirror.py) vea los cambios
+TOUCH_UPDATED_AT = '"updatedAt" = NOW()'
+
+# Margen hacia atrás de cada lectura incremental por "updatedAt" (réplica, claves de
+# búsqueda, colas de repaso): NOW() es la hora de inicio de la transacción, así que
+# una escritura larga puede confirmar con un "updatedAt" anterior a la marca de agua
+SYNC_OVERLAP = 10 * 60  # segundos
+
+
+def quote_ident(column):
+    """Cita un nombre de columna para PostgreSQL"""
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _copy_escape(value):
+    """Escapa un valor para el formato de texto de COPY"""
+    if value is None:
+        return '\\N'
+    text = str(value)
+    return (text.replace('\\', '\\\\')
+                .replace('\t', '\\t')
+                .replace('\n', '\\n')
+                .replace('\r', '\\r'))
+
+
+def rows_to_copy_buffer(rows):
+    """Serializa filas (tuplas) en un buffer con formato de texto de COPY"""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write('\t'.join(_copy_escape(value) for value in row))
+        buf.write('\n')
+    buf.seek(0)
+    return buf
+
+
+# Cabecera y fin del formato binario de COPY (PGCOPY)
+_BINARY_COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_BINARY_COPY_TRAILER = struct.pack('!h', -1)
+
+
+def _binary_field(value, pg_type):
+    """Codifica un valor en el formato binario de COPY para los tipos que usan los scripts"""
+    if value is None:
+        return struct.pack('!i', -1)
+    if pg_type == 'int4':
+        data = struct.pack('!i', value)
+    elif pg_type == 'bool':
+        data = b'\x01' if value else b'\x00'
+    elif pg_type == 'float8':
+        data = struct.pack('!d', value)
+    elif pg_type == 'jsonb':
+        # Versión 1 del formato jsonb seguida del texto JSON
+        data = b'\x01' + value.encode('utf-8')
+    else:
+        data = str(value).encode('utf-8')
+    return struct.pack('!i', len(data)) + data
+
+
+def rows_to_binary_copy_buffer(rows, pg_types):
+    """Serializa filas en un buffer con formato binario de COPY (WITH (FORMAT binary))
+
+    pg_types indica el tipo de cada columna: 'text', 'int4', 'bool', 'float8' o 'jsonb'.
+    Los valores jsonb se pasan ya serializados como texto JSON.
+    """
+    buf = io.BytesIO()
+    buf.write(_BINARY_COPY_HEADER)
+    field_count = struct.pack('!h', len(pg_types))
+    for row in rows:
+        buf.write(field_count)
+        for value, pg_type in zip(row, pg_types):
+            buf.write(_binary_field(value, pg_type))
+    buf.write(_BINARY_COPY_TRAILER)
+    buf.seek(0)
+    return buf
+
+
+def is_unchanged(new_values, current_values):
+    """Indica si los valores generados coinciden con los guardados en la base de datos
+
+    Las columnas jsonb llegan ya decodificadas por psycopg2 (listas/dicts), así que
+    los valores nuevos serializados con json.dumps se decodifican antes de comparar.
+    """
+    for new, current in zip(new_values, current_values):
+        if isinstance(new, str) and isinstance(current, (list, dict)):
+            new = json.loads(new)
+        if new != current:
+            return False
+    return True
+
+
+def _estimate_bytes(rows):
+    return sum(len(str(value)) for row in rows for value in row if value is not None)
+
+
+class AdaptiveBatcher:
+    """Elige el tamaño de cada lote para acercar su latencia a un objetivo
+
+    Mide el round-trip con un SELECT 1 y, tras cada lote, estima el tiempo de
+    servidor por fila (latencia menos round-trips por RTT). El siguiente lote es
+    el que cabría en el objetivo con ese coste, sin crecer más del doble ni bajar
+    de la mitad de una vez, y sin pasar de max_bytes de datos.
+    """
+
+    def __init__(self, target_latency=DEFAULT_TARGET_LATENCY, initial_size=100, min_size=ADAPTIVE_MIN_SIZE,
+                 max_size=ADAPTIVE_MAX_SIZE, max_bytes=ADAPTIVE_MAX_BYTES):
+        self.target_latency = target_latency
+        self.size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.rtt = None
+        self.row_time = None
+        self.row_bytes = None
+        self.batches = 0
+        self.rows = 0
+        self.seconds = 0.0
+
+    def measure_rtt(self, cursor):
+        start = time.perf_counter()
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+        self.rtt = time.perf_counter() - start
+
+    def record(self, rows, nbytes, seconds, round_trips):
+        """Registra un lote enviado y recalcula el tamaño del siguiente"""
+        self.batches += 1
+        self.rows += rows
+        self.seconds += seconds
+
+        network = round_trips * self.rtt
+        row_time = max(seconds - network, seconds * 0.05) / rows
+        row_bytes = max(nbytes, 1) / rows
+        # Media móvil para no reaccionar a un único lote lento
+        self.row_time = row_time if self.row_time is None else (self.row_time + row_time) / 2
+        self.row_bytes = row_bytes if self.row_bytes is None else (self.row_bytes + row_bytes) / 2
+
+        budget = self.target_latency - network
+        desired = budget / self.row_time if budget > 0 else self.size * 2
+        size = min(max(desired, self.size / 2), self.size * 2)
+        size = min(size, self.max_size, self.max_bytes / self.row_bytes)
+        self.size = max(int(size), self.min_size)
+
+    def settings(self):
+        """Ajustes elegidos y medidas en las que se basan"""
+        return {
+            'page_size': self.size,
+            'target_ms': round(self.target_latency * 1000, 1),
+            'rtt_ms': round((self.rtt or 0) * 1000, 1),
+            'avg_batch_ms': round(self.seconds / self.batches * 1000, 1) if self.batches else None,
+            'server_ms_per_row': round(self.row_time * 1000, 3) if self.row_time else None,
+            'batches': self.batches,
+        }
+
+    def report(self):
+        settings = self.settings()
+        measured = f"objetivo {settings['target_ms']} ms, RTT {settings['rtt_ms']} ms"
+        if settings['batches']:
+            server = settings['server_ms_per_row']
+            measured += (f", media {settings['avg_batch_ms']} ms/lote en {settings['batches']} lotes, "
+                         f"{server if server is not None else 'n/d'} ms/fila en servidor")
+        else:
+            measured += ", sin lotes enviados"
+        return (f"🎛️  Lote adaptativo: {settings['page_size']} filas/lote ({measured}) "
+                f"-> para fijarlo: --page-size {settings['page_size']}")
+
+
+class VerbWriter:
+    """Escribe lotes de actualizaciones en "Verb" (u otra tabla con clave id, como "Word")
+
+    Las actualizaciones usan el mismo formato que execute_batch en los scripts:
+    una tupla (valor_1, ..., valor_n, id) por verbo, en el orden de `columns`.
+    El writer no hace commit: la transacción la controla quien lo llama.
+
+    Con coalesce=True un valor None deja la columna como está, lo que permite
+    combinar en una sola escritura filas que solo actualizan parte de las columnas.
+
+    Con page_size='auto' (o 'auto:<ms>') las actualizaciones se envían en lotes
+    cuyo tamaño ajusta un AdaptiveBatcher según la latencia medida.
+
+    Con touch=True (por defecto) cada fila escrita recibe "updatedAt" = NOW().
+    """
+
+    def __init__(self, cursor, columns, mode=DEFAULT_WRITE_MODE, page_size=100, casts=None,
+                 coalesce=False, table='Verb', touch=True):
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Modo de escritura desconocido: {mode}")
+        self.cursor = cursor
+        self.columns = list(columns)
+        self.mode = mode
+        self.adaptive = None
+        if isinstance(page_size, str):
+            _, _, target_ms = page_size.partition(':')
+            self.adaptive = AdaptiveBatcher(
+                target_latency=float(target_ms) / 1000 if target_ms else DEFAULT_TARGET_LATENCY
+            )
+            page_size = self.adaptive.size
+        self.page_size = page_size
+        self.casts = casts or {}
+        self.coalesce = coalesce
+        self.table = table
+        self.touch = touch
+        self.staging_table = f'{table.lower()}_staging'
+        self.staging_ready = False
+        self.round_trips = 0
+
+    def write(self, updates):
+        """Envía las actualizaciones y devuelve el número de filas afectadas"""
+        if not updates:
+            return 0
+        if self.adaptive:
+            return self._write_adaptive(updates)
+        if self.mode == 'copy':
+            return self._write_copy(updates)
+        return self._write_batch(updates)
+
+    def _write_adaptive(self, updates):
+        if self.adaptive.rtt is None:
+            self.adaptive.measure_rtt(self.cursor)
+
+        written = 0
+        position = 0
+        while position < len(updates):
+            batch = updates[position:position + self.adaptive.size]
+            position += len(batch)
+            # En modo batch todo el lote se agrupa en un único envío de execute_batch
+            self.page_size = len(batch)
+            round_trips = self.round_trips
+            start = time.perf_counter()
+            written += self._write_copy(batch) if self.mode == 'copy' else self._write_batch(batch)
+            self.adaptive.record(
+                len(batch), _estimate_bytes(batch), time.perf_counter() - start, self.round_trips - round_trips
+            )
+        return written
+
+    def _assignment(self, column, value, current):
+        if self.coalesce:
+            return f'{quote_ident(column)} = COALESCE({value}, {current})'
+        return f'{quote_ident(column)} = {value}'
+
+    def _assignments(self, value, current):
+        assignments = [self._assignment(col, value(col), current(col)) for col in self.columns]
+        if self.touch:
+            assignments.append(TOUCH_UPDATED_AT)
+        return ',\n                '.join(assignments)
+
+    def _write_batch(self, updates):
+        assignments = self._assignments(lambda col: f'%s{self.casts.get(col, "")}', quote_ident)
+        update_query = f'''
+            UPDATE {quote_ident(self.table)}
+            SET {assignments}
+            WHERE id = %s
+        '''
+        execute_batch(self.cursor, update_query, updates, page_size=self.page_size)
+        self.round_trips += -(-len(updates) // self.page_size)
+        return len(updates)
+
+    def _ensure_staging(self):
+        """Crea la tabla temporal con los mismos tipos que la tabla destino (jsonb incluido)"""
+        if self.staging_ready:
+            self.cursor.execute(f'TRUNCATE {self.staging_table}')
+        else:
+            col_list = ', '.join(quote_ident(col) for col in self.columns)
+            self.cursor.execute(f'''
+                CREATE TEMP TABLE {self.staging_table}
+                ON COMMIT DROP AS
+                SELECT id, {col_list} FROM {quote_ident(self.table)} WITH NO DATA
+            ''')
+            self.staging_ready = True
+        self.round_trips += 1
+
+    def _write_copy(self, updates):
+        self._ensure_staging()
+
+        # COPY espera las columnas en orden (id, col_1, ..., col_n)
+        buf = rows_to_copy_buffer((row[-1],) + tuple(row[:-1]) for row in updates)
+        col_list = ', '.join(quote_ident(col) for col in self.columns)
+        self.cursor.copy_expert(
+            f'COPY {self.staging_table} (id, {col_list}) FROM STDIN', buf
+        )
+
+        assignments = self._assignments(lambda col: f's.{quote_ident(col)}', lambda col: f'v.{quote_ident(col)}')
+        self.cursor.execute(f'''
+            UPDATE {quote_ident(self.table)} AS v
+            SET {assignments}
+            FROM {self.staging_table} AS s
+            WHERE v.id = s.id
+        ''')
+        self.round_trips += 2
+        return self.cursor.rowcount
+
+    def reset(self):
+        """Olvida la tabla temporal (se elimina sola en cada commit)"""
+        self.staging_ready = False
+
+
+class DryRunWriter:
+    """Writer de --dry-run: cuenta las actualizaciones sin enviar nada a la base de datos"""
+    adaptive = None
+
+    def __init__(self, *args, **kwargs):
+        self.round_trips = 0
+
+    def write(self, updates):
+        return len(updates)
+
+    def reset(self):
+        pass
+
+
+def _range_conditions(id_range):
+    """Condiciones SQL y parámetros para un rango de ids (desde, hasta]; None = sin límite"""
+    conditions = []
+    params = []
+    if id_range:
+        lower, upper = id_range
+        if lower is not None:
+            conditions.append('id > %s')
+            params.append(lower)
+        if upper is not None:
+            conditions.append('id <= %s')
+            params.append(upper)
+    return conditions, params
+
+
+def iter_verb_chunks(conn, columns, itersize=DEFAULT_ITERSIZE, stream=True, table='Verb', id_range=None):
+    """Lee "Verb" por bloques de filas (id, col_1, ..., col_n)
+
+    Con stream=True usa un cursor con nombre (server-side): el servidor entrega
+    `itersize` filas por FETCH y la memoria no crece con el tamaño de la tabla.
+    El cursor vive dentro de la transacción actual, así que las escrituras de
+    cada bloque pueden intercalarse con las lecturas antes del commit final.
+    """
+    col_list = ', '.join(['id'] + [quote_ident(col) for col in columns])
+    query = f'SELECT {col_list} FROM {quote_ident(table)}'
+    conditions, params = _range_conditions(id_range)
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+
+    if not stream:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        cursor.close()
+        if rows:
+            yield rows
+        return
+
+    cursor = conn.cursor(name=f'{table.lower()}_stream')
+    cursor.itersize = itersize
+    cursor.execute(query, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(itersize)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def iter_verb_pages(conn, columns, page_size=DEFAULT_CHUNK_SIZE, after_id=None, table='Verb',
+                    id_range=None):
+    """Lee "Verb" por páginas ordenadas por id (paginación keyset)
+
+    A diferencia del cursor con nombre, cada página es una consulta independiente
+    (WHERE id > último_id ORDER BY id LIMIT n), así que se puede hacer commit entre
+    páginas y retomar la lectura desde cualquier id.
+    """
+    col_list = ', '.join(['id'] + [quote_ident(col) for col in columns])
+    lower, upper = id_range or (None, None)
+    if after_id is None or (lower is not None and lower > after_id):
+        after_id = lower
+    cursor = conn.cursor()
+    try:
+        while True:
+            conditions, params = _range_conditions((after_id, upper))
+            where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+            cursor.execute(
+                f'SELECT {col_list} FROM {quote_ident(table)}{where} ORDER BY id LIMIT %s',
+                params + [page_size]
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            yield rows
+            after_id = rows[-1][0]
+    finally:
+        cursor.close()
+
+
+class Checkpoint:
+    """Último id confirmado de una corrección, guardado en un fichero de estado local
+
+    El fichero también guarda los contadores acumulados, de modo que el resumen
+    final de una ejecución retomada con --resume cubre toda la pasada.
+    """
+
+    def __init__(self, name, directory=SCRIPTS_DIR):
+        self.path = os.path.join(directory, f'.{name}.checkpoint.json')
+
+    def load(self):
+        """Devuelve el estado guardado o None si no hay checkpoint"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def save(self, last_id, stats):
+        """Guarda el estado de forma atómica (fichero temporal + rename)"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'last_id': last_id, 'stats': stats}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def resume_point(checkpoint, resume, stats):
+    """Último id confirmado si se retoma una pasada (y restaura sus contadores en stats)
+
+    Si no se retoma, borra el checkpoint anterior y devuelve None.
+    """
+    if not checkpoint:
+        return None
+    state = checkpoint.load() if resume else None
+    if not state:
+        checkpoint.clear()
+        return None
+    stats.update(state['stats'])
+    print(f"↩️  Retomando desde el id {state['last_id']} ({stats['total']} verbos ya procesados)")
+    return state['last_id']
+
+
+def process_verbs(conn, writer, columns, build_updates, stream=True, itersize=DEFAULT_ITERSIZE,
+                  chunk_size=None, checkpoint=None, resume=False, table='Verb', id_range=None, source=None):
+    """Recorre "Verb" por bloques, genera las actualizaciones y las escribe
+
+    `build_updates(filas)` recibe filas (id, col_1, ..., col_n) y devuelve
+    (updates, not_found, skipped).
+
+    Sin chunk_size todo ocurre en una sola transacción con un único commit final.
+    Con chunk_size se lee por páginas ordenadas por id, se hace commit cada
+    chunk_size verbos y, si hay checkpoint, se registra el último id confirmado
+    para que resume=True continúe desde ahí.
+
+    Con id_range=(desde, hasta] solo se recorren los ids de ese rango.
+
+    Con source (una VerbMirror) las filas se leen de la réplica local en lugar de
+    la conexión; si además el writer es un DryRunWriter, conn puede ser None.
+    """
+    if resume and not chunk_size:
+        chunk_size = DEFAULT_CHUNK_SIZE
+
+    stats = {'total': 0, 'updated': 0, 'skipped': 0, 'not_found': []}
+
+    if chunk_size:
+        after_id = resume_point(checkpoint, resume, stats)
+        if source:
+            chunks = source.iter_chunks(table, columns, chunk_size, after_id=after_id, id_range=id_range)
+        else:
+            chunks = iter_verb_pages(conn, columns, page_size=chunk_size, after_id=after_id, table=table,
+                                     id_range=id_range)
+    elif source:
+        chunks = source.iter_chunks(table, columns, itersize, id_range=id_range)
+    else:
+        chunks = iter_verb_chunks(conn, columns, itersize=itersize, stream=stream, table=table,
+                                  id_range=id_range)
+
+    while True:
+        with span('select') as select_span:
+            rows = next(chunks, None)
+            select_span.rows_out = len(rows) if rows else 0
+        if rows is None:
+            break
+
+        with span('generate_updates', rows_in=len(rows)) as generate_span:
+            updates, not_found, skipped = build_updates(rows)
+            generate_span.rows_out = len(updates)
+        stats['total'] += len(rows)
+        stats['skipped'] += skipped
+        stats['not_found'].extend(not_found)
+
+        if updates:
+            with span('write', rows_in=len(updates)) as write_span:
+                write_span.rows_out = writer.write(updates)
+            stats['updated'] += len(updates)
+
+        if chunk_size and conn is not None:
+            with span('commit'):
+                conn.commit()
+            writer.reset()
+            if checkpoint:
+                checkpoint.save(rows[-1][0], stats)
+
+    if writer.adaptive:
+        print(writer.adaptive.report())
+
+    if not chunk_size and conn is not None:
+        with span('commit'):
+            conn.commit()
+    elif checkpoint:
+        # Pasada completa: la próxima ejecución empieza desde cero
+        checkpoint.clear()
+
+    return stats
+
+
+def partition_bounds(conn, partitions, table='Verb'):
+    """Reparte los ids de la tabla en rangos (desde, hasta] disjuntos y de tamaño parecido
+
+    El primer rango no tiene límite inferior ni el último superior, así que
+    también se cubren los ids insertados mientras dura la pasada.
+    """
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        SELECT max(id) FROM (
+            SELECT id, ntile(%s) OVER (ORDER BY id) AS part FROM {quote_ident(table)}
+        ) AS parts
+        GROUP BY part
+        ORDER BY part
+    ''', (partitions,))
+    uppers = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+
+    bounds = []
+    lower = None
+    for upper in uppers[:-1]:
+        bounds.append((lower, upper))
+        lower = upper
+    bounds.append((lower, None))
+    return bounds
+
+
+def process_verbs_parallel(database_url, workers, make_writer, columns, build_updates, stream=True,
+                           itersize=DEFAULT_ITERSIZE, chunk_size=None, resume=False, table='Verb'):
+    """Como process_verbs, pero con la tabla repartida en `workers` rangos de id en paralelo
+
+    Cada rango se procesa en un hilo con su propia conexión del pool y sus propias
+    transacciones (una por rango, o una por bloque con chunk_size).
+    `make_writer(cursor)` crea el VerbWriter de cada conexión; build_updates se
+    llama desde varios hilos a la vez, así que no debe modificar estado compartido.
+
+    Devuelve las estadísticas agregadas, con los round-trips sumados en
+    'round_trips' y el detalle de cada rango en 'partitions'.
+    """
+    if resume:
+        # Los rangos se recalculan en cada ejecución: un checkpoint no sería fiable
+        print("⚠️  --resume no está disponible con --workers: se recorre toda la tabla")
+    pool = ThreadedConnectionPool(1, workers, database_url)
+    try:
+        conn = pool.getconn()
+        bounds = partition_bounds(conn, workers, table=table)
+        conn.commit()
+        pool.putconn(conn)
+
+        def run_partition(id_range):
+            conn = pool.getconn()
+            try:
+                start = time.perf_counter()
+                cursor = conn.cursor()
+                writer = make_writer(cursor)
+                stats = process_verbs(
+                    conn, writer, columns, build_updates, stream=stream, itersize=itersize,
+                    chunk_size=chunk_size, table=table, id_range=id_range
+                )
+                cursor.close()
+                stats['round_trips'] = writer.round_trips
+                stats['seconds'] = time.perf_counter() - start
+                return stats
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                pool.putconn(conn)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            partitions = list(executor.map(run_partition, bounds))
+    finally:
+        pool.closeall()
+
+    stats = {'total': 0, 'updated': 0, 'skipped': 0, 'not_found': [], 'round_trips': 0}
+    for i, (part, (lower, upper)) in enumerate(zip(partitions, bounds), start=1):
+        for key in ('total', 'updated', 'skipped', 'round_trips'):
+            stats[key] += part[key]
+        stats['not_found'].extend(part['not_found'])
+        print(f"   🧵 Rango {i}/{len(bounds)} ({lower or '-∞'} .. {upper or '+∞'}]: "
+              f"{part['total']} filas, {part['updated']} actualizadas en {part['seconds']:.2f}s")
+    stats['partitions'] = partitions
+    return stats
+
+
+def add_reader_arguments(parser):
+    """Añade las opciones de lectura comunes a un ArgumentParser"""
+    parser.add_argument(
+        '--no-stream', dest='stream', action='store_false',
+        help='Leer toda la tabla con fetchall() en lugar de un cursor server-side'
+    )
+    parser.add_argument(
+        '--itersize', type=int, default=DEFAULT_ITERSIZE,
+        help='Filas por bloque al leer con el cursor server-side'
+    )
+    parser.add_argument(
+        '--chunk-size', type=int, default=None,
+        help='Hacer commit cada N verbos y guardar un checkpoint del último id procesado'
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help=f'Continuar desde el último checkpoint (implica --chunk-size {DEFAULT_CHUNK_SIZE} si no se indica)'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Procesar la tabla en N rangos de id en paralelo, cada uno con su conexión (sin checkpoint)'
+    )
+    return parser
+
+
+def parse_page_size(value):
+    """Tipo de argparse para --page-size: un entero, 'auto' o 'auto:<ms objetivo por lote>'"""
+    if value == 'auto':
+        return value
+    if value.startswith('auto:'):
+        if float(value[len('auto:'):]) <= 0:
+            raise argparse.ArgumentTypeError(f"el objetivo de {value!r} debe ser mayor que 0 ms")
+        return value
+    if int(value) < 1:
+        raise argparse.ArgumentTypeError(f"el tamaño de lote debe ser al menos 1 (recibido {value})")
+    return int(value)
+
+
+def add_writer_arguments(parser):
+    """Añade las opciones de escritura comunes a un ArgumentParser"""
+    parser.add_argument(
+        '--writer', choices=WRITE_MODES, default=DEFAULT_WRITE_MODE,
+        help='Modo de escritura: copy (tabla temporal + UPDATE ... FROM) o batch (execute_batch)'
+    )
+    parser.add_argument(
+        '--page-size', type=parse_page_size, default=100,
+        help=('Tamaño de página para el modo batch, o "auto" / "auto:<ms>" para ajustar el tamaño '
+              f'de lote a una latencia objetivo (por defecto {int(DEFAULT_TARGET_LATENCY * 1000)} ms)')
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true',
+        help='Calcular las actualizaciones sin escribir nada (ni guardar checkpoint)'
+    )
+    return parser
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Corpus de ejemplos predefinidos de los scripts de corrección de verbos
+
+Los ejemplos viven en data/verb_examples.json, no en el código:
+
+  by_english  verbo inglés -> {"spanish": infinitivo, "examples": [3 frases]}
+              (fix_verb_translations_v2.py)
+  by_spanish  infinitivo español -> "frase en español. / English sentence."
+              (fix_verb_translations.py)
+
+El fichero se lee la primera vez que se pide un ejemplo y queda en caché para
+el resto del proceso, así que importar los scripts no cuesta nada aunque el
+corpus crezca. Para añadir ejemplos basta con editar el JSON.
+"""
+import os
+import json
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES_PATH = os.path.join(ROOT_DIR, 'data', 'verb_examples.json')
+
+_corpus = {}
+
+
+def load_verb_examples(path=EXAMPLES_PATH):
+    """Devuelve el corpus completo, leyéndolo solo la primera vez"""
+    corpus = _corpus.get(path)
+    if corpus is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            corpus = json.load(f)
+        _corpus[path] = corpus
+    return corpus
+
+
+def examples_by_english(path=EXAMPLES_PATH):
+    """Verbo inglés -> {'spanish': ..., 'examples': [...]}"""
+    return load_verb_examples(path)['by_english']
+
+
+def examples_by_spanish(path=EXAMPLES_PATH):
+    """Infinitivo español -> ejemplo bilingüe "español. / English.\""""
+    return load_verb_examples(path)['by_spanish']
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Réplica local (SQLite) de las tablas "Verb" y "Word" de Neon PostgreSQL
+
+Cada corrección o análisis volvía a leer la tabla entera desde Neon. La réplica
+guarda una copia en scripts/.cache/mirror.sqlite3 y la mantiene al día:
+
+  - sincronización incremental: solo se piden las filas con "updatedAt" a partir
+    de la marca de agua (high-water mark) de la última sincronización, con un
+    margen de SYNC_OVERLAP por las transacciones que confirman tarde
+  - diff de ids periódico (cada DEFAULT_DIFF_INTERVAL o con --full-diff): se
+    comparan los ids remotos y locales para borrar las filas eliminadas y
+    recuperar las que no llegaron por "updatedAt"
+
+Las lecturas (análisis, matching, --dry-run) van a la réplica a velocidad de
+disco local; las escrituras siguen yendo a la base de datos remota. Los writers
+de verb_db marcan "updatedAt", así que la siguiente sincronización trae sus
+cambios.
+
+Uso:
+    python verb_mirror.py                 # sincronizar Verb y Word
+    python verb_mirror.py --full-diff     # forzar también el diff de ids
+"""
+import os
+import json
+import time
+import sqlite3
+import argparse
+from datetime import datetime
+
+import psycopg2
+
+from instrumentation import span
+from verb_db import quote_ident, SCRIPTS_DIR, DEFAULT_ITERSIZE, SYNC_OVERLAP
+
+MIRROR_PATH = os.path.join(SCRIPTS_DIR, '.cache', 'mirror.sqlite3')
+MIRROR_TABLES = ('Verb', 'Word')
+UPDATED_AT = 'updatedAt'
+
+# Cada cuánto se comparan los conjuntos de ids para detectar borrados
+DEFAULT_DIFF_INTERVAL = 24 * 60 * 60  # segundos
+
+# Tipos de PostgreSQL (OID de cursor.description) que necesitan conversión en SQLite
+_JSON_OIDS = {114, 3802}        # json, jsonb
+_BOOL_OIDS = {16}
+_TIMESTAMP_OIDS = {1114, 1184}  # timestamp, timestamptz
+
+
+def _column_kind(type_code):
+    if type_code in _JSON_OIDS:
+        return 'json'
+    if type_code in _BOOL_OIDS:
+        return 'bool'
+    if type_code in _TIMESTAMP_OIDS:
+        return 'timestamp'
+    return 'value'
+
+
+def _to_sqlite(value, kind):
+    if value is None:
+        return None
+    if kind == 'json':
+        return json.dumps(value)
+    if kind == 'bool':
+        return int(value)
+    if kind == 'timestamp':
+        return value.isoformat()
+    return value
+
+
+def _from_sqlite(value, kind):
+    """Devuelve el valor tal como lo entregaría psycopg2 (jsonb decodificado, bool, datetime)"""
+    if value is None:
+        return None
+    if kind == 'json':
+        return json.loads(value)
+    if kind == 'bool':
+        return bool(value)
+    if kind == 'timestamp':
+        return datetime.fromisoformat(value)
+    return value
+
+
+class VerbMirror:
+    """Copia local de tablas con clave id y columna "updatedAt"
+
+    Las columnas se descubren de la tabla remota; si cambian, la tabla local se
+    recrea y se vuelve a copiar entera.
+    """
+
+    def __init__(self, path=MIRROR_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS _mirror_columns (
+                table_name TEXT, position INTEGER, column_name TEXT, kind TEXT,
+                PRIMARY KEY (table_name, position)
+            )
+        ''')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS _sync_state (
+                table_name TEXT PRIMARY KEY, high_water TEXT, last_diff REAL, synced_at REAL
+            )
+        ''')
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    # Esquema
+    def columns(self, table):
+        """[(columna, tipo)] de la tabla local, en orden"""
+        return self.db.execute(
+            'SELECT column_name, kind FROM _mirror_columns WHERE table_name = ? ORDER BY position', (table,)
+        ).fetchall()
+
+    def _remote_columns(self, conn, table):
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT * FROM {quote_ident(table)} LIMIT 0')
+        columns = [(col.name, _column_kind(col.type_code)) for col in cursor.description]
+        cursor.close()
+        return columns
+
+    def _ensure_table(self, table, columns):
+        """Crea (o recrea si el esquema remoto cambió) la tabla local; devuelve True si está vacía"""
+        if self.columns(table) == columns:
+            return False
+        self.db.execute(f'DROP TABLE IF EXISTS {quote_ident(table)}')
+        col_defs = ', '.join(
+            quote_ident(name) + (' TEXT PRIMARY KEY' if name == 'id' else '') for name, _ in columns
+        )
+        self.db.execute(f'CREATE TABLE {quote_ident(table)} ({col_defs})')
+        self.db.execute(f'CREATE INDEX {quote_ident(table.lower() + "_updated_at")} '
+                        f'ON {quote_ident(table)} ({quote_ident(UPDATED_AT)})')
+        self.db.execute('DELETE FROM _mirror_columns WHERE table_name = ?', (table,))
+        self.db.executemany(
+            'INSERT INTO _mirror_columns VALUES (?, ?, ?, ?)',
+            [(table, position, name, kind) for position, (name, kind) in enumerate(columns)]
+        )
+        self.db.execute('DELETE FROM _sync_state WHERE table_name = ?', (table,))
+        return True
+
+    def state(self, table):
+        row = self.db.execute(
+            'SELECT high_water, last_diff, synced_at FROM _sync_state WHERE table_name = ?', (table,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'high_water': row[0], 'last_diff': row[1], 'synced_at': row[2]}
+
+    # Sincronización
+    def _upsert(self, table, columns, rows):
+        col_list = ', '.join(quote_ident(name) for name, _ in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        self.db.executemany(
+            f'INSERT OR REPLACE INTO {quote_ident(table)} ({col_list}) VALUES ({placeholders})',
+            ([_to_sqlite(value, kind) for value, (_, kind) in zip(row, columns)] for row in rows)
+        )
+
+    def _pull_changes(self, conn, table, columns, high_water, itersize):
+        """Copia las filas con "updatedAt" >= marca de agua - margen; devuelve (filas, nueva marca)"""
+        col_list = ', '.join(quote_ident(name) for name, _ in columns)
+        query = f'SELECT {col_list} FROM {quote_ident(table)}'
+        params = []
+        if high_water:
+            query += f' WHERE {quote_ident(UPDATED_AT)} >= %s::timestamp - %s * interval \'1 second\''
+            params = [high_water, SYNC_OVERLAP]
+        query += f' ORDER BY {quote_ident(UPDATED_AT)}, id'
+
+        updated_at = [name for name, _ in columns].index(UPDATED_AT)
+        cursor = conn.cursor(name=f'{table.lower()}_mirror')
+        cursor.itersize = itersize
+        cursor.execute(query, params)
+        pulled = 0
+        try:
+            while True:
+                rows = cursor.fetchmany(itersize)
+                if not rows:
+                    break
+                self._upsert(table, columns, rows)
+                pulled += len(rows)
+                high_water = max(high_water or '', rows[-1][updated_at].isoformat())
+        finally:
+            cursor.close()
+        return pulled, high_water
+
+    def _diff_ids(self, conn, table, columns, itersize):
+        """Borra las filas locales que ya no existen y copia las remotas que faltan"""
+        cursor = conn.cursor(name=f'{table.lower()}_mirror_ids')
+        cursor.itersize = itersize
+        cursor.execute(f'SELECT id FROM {quote_ident(table)}')
+        remote_ids = {row[0] for row in cursor}
+        cursor.close()
+        local_ids = {row[0] for row in self.db.execute(f'SELECT id FROM {quote_ident(table)}')}
+
+        deleted = local_ids - remote_ids
+        self.db.executemany(f'DELETE FROM {quote_ident(table)} WHERE id = ?', ((verb_id,) for verb_id in deleted))
+
+        missing = sorted(remote_ids - local_ids)
+        col_list = ', '.join(quote_ident(name) for name, _ in columns)
+        cursor = conn.cursor()
+        for start in range(0, len(missing), itersize):
+            cursor.execute(
+                f'SELECT {col_list} FROM {quote_ident(table)} WHERE id = ANY(%s)', (missing[start:start + itersize],)
+            )
+            self._upsert(table, columns, cursor.fetchall())
+        cursor.close()
+        return len(deleted), len(missing)
+
+    def sync(self, conn, table, full_diff=False, diff_interval=DEFAULT_DIFF_INTERVAL, itersize=DEFAULT_ITERSIZE):
+        """Pone al día la copia local de `table` y devuelve las estadísticas de la sincronización"""
+        columns = self._remote_columns(conn, table)
+        recreated = self._ensure_table(table, columns)
+        state = self.state(table) or {'high_water': None, 'last_diff': None, 'synced_at': None}
+        now = time.time()
+
+        with span('mirror_pull') as pull_span:
+            pulled, high_water = self._pull_changes(conn, table, columns, state['high_water'], itersize)
+            pull_span.rows_out = pulled
+
+        # La primera copia es completa: no hace falta diff hasta que pase el intervalo
+        deleted = recovered = 0
+        last_diff = state['last_diff']
+        if state['high_water'] is None:
+            last_diff = now
+        elif full_diff or last_diff is None or now - last_diff >= diff_interval:
+            with span('mirror_diff') as diff_span:
+                deleted, recovered = self._diff_ids(conn, table, columns, itersize)
+                diff_span.rows_out = deleted + recovered
+            last_diff = now
+
+        self.db.execute(
+            'INSERT OR REPLACE INTO _sync_state VALUES (?, ?, ?, ?)', (table, high_water, last_diff, now)
+        )
+        self.db.commit()
+        conn.commit()
+
+        return {
+            'table': table,
+            'full': recreated or state['high_water'] is None,
+            'pulled': pulled,
+            'deleted': deleted,
+            'recovered': recovered,
+            'rows': self.count(table),
+            'high_water': high_water,
+        }
+
+    # Lectura
+    def count(self, table):
+        return self.db.execute(f'SELECT count(*) FROM {quote_ident(table)}').fetchone()[0]
+
+    def iter_chunks(self, table, columns, chunk_size=DEFAULT_ITERSIZE, after_id=None, id_range=None):
+        """Lee la copia local por bloques (id, col_1, ..., col_n) ordenados por id
+
+        Mismo formato que iter_verb_chunks / iter_verb_pages, con los jsonb ya
+        decodificados, para poder pasarla como source a process_verbs.
+        """
+        kinds = dict(self.columns(table))
+        missing = [col for col in columns if col not in kinds]
+        if missing:
+            raise ValueError(f"La réplica de {table} no tiene las columnas {missing}: sincroniza primero")
+        col_kinds = [kinds[col] for col in columns]
+        col_list = ', '.join(['id'] + [quote_ident(col) for col in columns])
+
+        lower, upper = id_range or (None, None)
+        if after_id is None or (lower is not None and lower > after_id):
+            after_id = lower
+        while True:
+            conditions = []
+            params = []
+            if after_id is not None:
+                conditions.append('id > ?')
+                params.append(after_id)
+            if upper is not None:
+                conditions.append('id <= ?')
+                params.append(upper)
+            where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+            rows = self.db.execute(
+                f'SELECT {col_list} FROM {quote_ident(table)}{where} ORDER BY id LIMIT ?', params + [chunk_size]
+            ).fetchall()
+            if not rows:
+                break
+            yield [
+                (row[0],) + tuple(_from_sqlite(value, kind) for value, kind in zip(row[1:], col_kinds))
+                for row in rows
+            ]
+            after_id = rows[-1][0]
+
+
+def print_sync_stats(stats):
+    kind = 'copia completa' if stats['full'] else 'incremental'
+    print(f"🪞 Réplica local {stats['table']} ({kind}): {stats['pulled']} filas copiadas, "
+          f"{stats['deleted']} borradas, {stats['recovered']} recuperadas por diff de ids, "
+          f"{stats['rows']} en total (updatedAt hasta {stats['high_water']})")
+
+
+def open_mirror(database_url, tables=('Verb',), sync=True, full_diff=False, path=MIRROR_PATH):
+    """Abre la réplica local y, salvo sync=False, la sincroniza antes de devolverla"""
+    mirror = VerbMirror(path)
+    if sync:
+        conn = psycopg2.connect(database_url)
+        try:
+            for table in tables:
+                print_sync_stats(mirror.sync(conn, table, full_diff=full_diff))
+        finally:
+            conn.close()
+    else:
+        for table in tables:
+            state = mirror.state(table)
+            if state is None:
+                raise ValueError(f"La réplica local no tiene {table}: ejecuta antes verb_mirror.py o usa --mirror")
+            print(f"🪞 Réplica local {table} sin sincronizar (última sincronización: "
+                  f"{datetime.fromtimestamp(state['synced_at']).isoformat(timespec='seconds')})")
+    return mirror
+
+
+def add_mirror_arguments(parser):
+    """Añade las opciones de réplica local a un ArgumentParser"""
+    parser.add_argument(
+        '--mirror', action='store_const', const='sync', default=None,
+        help='Leer los verbos de la réplica local (se sincroniza antes); las escrituras van a la base remota'
+    )
+    parser.add_argument(
+        '--mirror-offline', action='store_const', const='offline', dest='mirror',
+        help='Leer de la réplica local tal como está, sin sincronizarla (útil con --dry-run)'
+    )
+    return parser
+
+
+# Main
+if __name__ == '__main__':
+    from fix_verb_translations import load_env
+
+    parser = argparse.ArgumentParser(description='Sincroniza la réplica local de "Verb" y "Word"')
+    parser.add_argument(
+        '--tables', nargs='+', default=list(MIRROR_TABLES),
+        help='Tablas a sincronizar'
+    )
+    parser.add_argument(
+        '--full-diff', action='store_true',
+        help='Comparar también los conjuntos de ids (borrados) aunque no toque por intervalo'
+    )
+    parser.add_argument(
+        '--path', default=MIRROR_PATH,
+        help='Fichero SQLite de la réplica'
+    )
+    args = parser.parse_args()
+
+    database_url = load_env().get('DATABASE_URL')
+    if not database_url:
+        print("❌ ERROR: No se encontró DATABASE_URL en .env")
+        exit(1)
+
+    start = time.perf_counter()
+    open_mirror(database_url, tables=args.tables, full_diff=args.full_diff, path=args.path).close()
+    print(f"\n✅ Réplica sincronizada en {time.perf_counter() - start:.2f}s: {args.path}")
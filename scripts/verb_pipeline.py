@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Modo en tubería (pipeline) con asyncio y asyncpg para corregir "Verb"
+
+process_verbs lee un bloque, genera sus actualizaciones y lo escribe, una fase
+detrás de otra. Aquí las tres fases son tareas de asyncio unidas por colas
+acotadas:
+
+  lectura (keyset) -> generación (en un hilo) -> escritura (sentencia preparada)
+
+Mientras se escribe un bloque ya se están leyendo y generando los siguientes, así
+que con una base de datos remota el tiempo total se acerca al de la fase más lenta
+en lugar de a la suma de las tres. Lectura y escritura usan conexiones distintas
+de un pool de asyncpg; cada bloque se confirma en su propia transacción y, si hay
+checkpoint, se registra el último id escrito.
+
+asyncpg es opcional: solo hace falta para este modo (pip install asyncpg, o
+pip install -r scripts/requirements.txt).
+"""
+import json
+import time
+import asyncio
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+from verb_db import quote_ident, resume_point, DEFAULT_CHUNK_SIZE, TOUCH_UPDATED_AT
+
+# Bloques en vuelo entre dos fases (acota la memoria)
+DEFAULT_QUEUE_SIZE = 4
+
+# Parámetros de libpq que asyncpg no entiende (los enviaría como ajustes del servidor)
+_LIBPQ_ONLY_PARAMS = ('connect_timeout', 'channel_binding')
+
+_DONE = object()
+
+
+def asyncpg_dsn(database_url):
+    """Adapta una DATABASE_URL de libpq/psycopg2 a asyncpg
+
+    Devuelve (dsn, timeout): connect_timeout pasa a ser el timeout de conexión y
+    se quitan los parámetros que solo entiende libpq.
+    """
+    parts = urlsplit(database_url)
+    params = parse_qsl(parts.query)
+    timeout = next((float(value) for key, value in params if key == 'connect_timeout'), 60)
+    query = urlencode([(key, value) for key, value in params if key not in _LIBPQ_ONLY_PARAMS])
+    return urlunsplit(parts._replace(query=query)), timeout
+
+
+async def _init_connection(conn):
+    # Igual que con psycopg2: jsonb se lee decodificado y se escribe desde el texto JSON
+    await conn.set_type_codec(
+        'jsonb',
+        schema='pg_catalog',
+        encoder=lambda value: value if isinstance(value, str) else json.dumps(value),
+        decoder=json.loads,
+        format='text'
+    )
+
+
+def update_query(columns, casts=None, coalesce=False, table='Verb'):
+    """UPDATE con parámetros posicionales ($1..$n, id en $n+1) para una sentencia preparada"""
+    casts = casts or {}
+    assignments = []
+    for position, column in enumerate(columns, start=1):
+        value = f'${position}{casts.get(column, "")}'
+        if coalesce:
+            value = f'COALESCE({value}, {quote_ident(column)})'
+        assignments.append(f'{quote_ident(column)} = {value}')
+    assignments.append(TOUCH_UPDATED_AT)
+    return (f'UPDATE {quote_ident(table)} SET {", ".join(assignments)} '
+            f'WHERE id = ${len(columns) + 1}')
+
+# Fases
+async def _read_pages(pool, columns, chunk_size, after_id, table, output, timings):
+    col_list = ', '.join(['id'] + [quote_ident(col) for col in columns])
+    async with pool.acquire() as conn:
+        while True:
+            start = time.perf_counter()
+            if after_id is None:
+                rows = await conn.fetch(
+                    f'SELECT {col_list} FROM {quote_ident(table)} ORDER BY id LIMIT $1', chunk_size
+                )
+            else:
+                rows = await conn.fetch(
+                    f'SELECT {col_list} FROM {quote_ident(table)} WHERE id > $1 ORDER BY id LIMIT $2',
+                    after_id, chunk_size
+                )
+            timings['read'] += time.perf_counter() - start
+            if not rows:
+                break
+            rows = [tuple(row) for row in rows]
+            await output.put(rows)
+            after_id = rows[-1][0]
+    await output.put(_DONE)
+
+
+async def _generate_updates(build_updates, source, output, timings):
+    # build_updates es código Python síncrono: se ejecuta en un hilo para que el
+    # bucle de eventos siga atendiendo la lectura y la escritura mientras tanto
+    loop = asyncio.get_running_loop()
+    while True:
+        rows = await source.get()
+        if rows is _DONE:
+            break
+        start = time.perf_counter()
+        result = await loop.run_in_executor(None, build_updates, rows)
+        timings['generate'] += time.perf_counter() - start
+        await output.put((rows, result))
+    await output.put(_DONE)
+
+
+async def _write_updates(pool, query, source, stats, checkpoint, timings):
+    async with pool.acquire() as conn:
+        statement = await conn.prepare(query)
+        while True:
+            item = await source.get()
+            if item is _DONE:
+                break
+            rows, (updates, not_found, skipped) = item
+
+            start = time.perf_counter()
+            if updates:
+                async with conn.transaction():
+                    await statement.executemany(updates)
+            timings['write'] += time.perf_counter() - start
+
+            stats['total'] += len(rows)
+            stats['skipped'] += skipped
+            stats['not_found'].extend(not_found)
+            stats['updated'] += len(updates)
+            if checkpoint:
+                checkpoint.save(rows[-1][0], stats)
+
+
+async def _run_pipeline(database_url, read_columns, write_columns, build_updates, chunk_size,
+                        checkpoint, resume, table, casts, coalesce, queue_size):
+    stats = {'total': 0, 'updated': 0, 'skipped': 0, 'not_found': []}
+    after_id = resume_point(checkpoint, resume, stats)
+    timings = {'read': 0.0, 'generate': 0.0, 'write': 0.0}
+    rows_queue = asyncio.Queue(maxsize=queue_size)
+    updates_queue = asyncio.Queue(maxsize=queue_size)
+    query = update_query(write_columns, casts=casts, coalesce=coalesce, table=table)
+
+    dsn, timeout = asyncpg_dsn(database_url)
+    start = time.perf_counter()
+    async with asyncpg.create_pool(dsn, min_size=2, max_size=2, timeout=timeout,
+                                   init=_init_connection) as pool:
+        tasks = [
+            asyncio.create_task(_read_pages(pool, read_columns, chunk_size, after_id, table,
+                                            rows_queue, timings)),
+            asyncio.create_task(_generate_updates(build_updates, rows_queue, updates_queue, timings)),
+            asyncio.create_task(_write_updates(pool, query, updates_queue, stats, checkpoint, timings)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Si una fase falla, las otras quedarían esperando en las colas
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    timings['total'] = time.perf_counter() - start
+
+    if checkpoint:
+        checkpoint.clear()
+    return stats, timings
+
+
+def process_verbs_pipelined(database_url, read_columns, write_columns, build_updates, chunk_size=None,
+                            checkpoint=None, resume=False, table='Verb', casts=None, coalesce=False,
+                            queue_size=DEFAULT_QUEUE_SIZE):
+    """Equivalente a process_verbs con lectura, generación y escritura solapadas
+
+    `build_updates(filas)` recibe filas (id, col_1, ..., col_n) de read_columns y
+    devuelve (updates, not_found, skipped), con updates en el orden de write_columns.
+    Devuelve las mismas estadísticas que process_verbs.
+    """
+    if asyncpg is None:
+        raise RuntimeError("El modo pipeline necesita asyncpg (pip install asyncpg)")
+
+    stats, timings = asyncio.run(_run_pipeline(
+        database_url, read_columns, write_columns, build_updates, chunk_size or DEFAULT_CHUNK_SIZE,
+        checkpoint, resume, table, casts, coalesce, queue_size
+    ))
+    print(f"⏱️  Pipeline: lectura {timings['read']:.2f}s, generación {timings['generate']:.2f}s, "
+          f"escritura {timings['write']:.2f}s -> total {timings['total']:.2f}s")
+    return stats
+
+
+def add_pipeline_arguments(parser):
+    """Añade las opciones del modo pipeline a un ArgumentParser"""
+    parser.add_argument(
+        '--pipeline', action='store_true',
+        help='Solapar lectura, generación y escritura con asyncio y asyncpg (commit por bloque)'
+    )
+    parser.add_argument(
+        '--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+        help='Bloques en vuelo entre fases del modo pipeline'
+    )
+    return parser